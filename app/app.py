@@ -1,20 +1,27 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import joblib
-import pickle
-import os
+import gzip
+import io
 import sys
 import json
+import threading
+from collections import namedtuple
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
-# Import custom modules
-from plots import create_sankey_diagram, create_energy_comparison, create_emissions_comparison, create_circularity_comparison, create_metal_comparison_chart, create_circularity_scatter_plot, create_comprehensive_dashboard
-from recommendations import get_circularity_recommendations, get_environmental_recommendations
+# Import custom modules (plots is imported where charts are drawn, keeping plotly off the first paint)
+from recommendations import get_circularity_recommendations_markdown, get_environmental_recommendations_markdown
 
 # Configure Streamlit page
 st.set_page_config(
@@ -25,7 +32,7 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
+_CSS_GLOBAL = """
 <style>
     .main {
         padding-top: 1rem;
@@ -43,19 +50,110 @@ st.markdown("""
         padding: 1rem;
         box-shadow: 0 2px 4px rgba(0,0,0,0.1);
     }
-    .pathway-comparison {
-        background-color: #f8f9ff;
-        border-left: 4px solid #4CAF50;
-        padding: 1rem;
-        margin: 1rem 0;
-    }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Custom CSS for better metrics visibility
+_CSS_MAIN = """
+    <style>
+    /* Enhanced metrics styling with better targeting */
+    [data-testid="metric-container"] {
+        background: linear-gradient(135deg, #4f46e5 0%, #7c3aed 100%) !important;
+        border: 2px solid #e0e7ff !important;
+        padding: 20px !important;
+        border-radius: 12px !important;
+        box-shadow: 0 4px 12px rgba(0,0,0,0.15) !important;
+        margin: 8px 0 !important;
+    }
+    
+    [data-testid="metric-container"] > div {
+        color: white !important;
+    }
+    
+    [data-testid="metric-container"] [data-testid="metric-value"] {
+        color: #ffffff !important;
+        font-weight: bold !important;
+        font-size: 1.5em !important;
+        text-shadow: 1px 1px 2px rgba(0,0,0,0.3) !important;
+    }
+    
+    [data-testid="metric-container"] [data-testid="metric-label"] {
+        color: #e0e7ff !important;
+        font-weight: 600 !important;
+        font-size: 0.9em !important;
+        text-shadow: 1px 1px 2px rgba(0,0,0,0.3) !important;
+    }
+    
+    /* Green gradient for circularity section */
+    .stMarkdown:has(+ .stColumns) ~ .stColumns [data-testid="metric-container"] {
+        background: linear-gradient(135deg, #059669 0%, #10b981 100%) !important;
+        border-color: #d1fae5 !important;
+    }
+    
+    /* Ensure all text in metrics is white */
+    [data-testid="metric-container"] * {
+        color: white !important;
+    }
+    
+    /* Alternative approach using nth-child */
+    .stColumns:nth-of-type(2) [data-testid="metric-container"] {
+        background: linear-gradient(135deg, #059669 0%, #10b981 100%) !important;
+    }
+    
+    /* Force override any conflicting styles */
+    div[data-testid="stMetricValue"] > div {
+        color: #ffffff !important;
+    }
+    
+    div[data-testid="stMetricLabel"] > div {
+        color: #e0e7ff !important;
+    }
+    </style>
+    """
+
+# Streamlit drops elements that are not re-emitted on a rerun, so the
+# combined stylesheet is sent as one element on every run
+_CSS = _CSS_GLOBAL + _CSS_MAIN
+
+# Prediction metric card, filled per indicator
+_CARD_TMPL = (
+    '<div style="background: linear-gradient(135deg, {start} 0%, {end} 100%); padding: 20px; '
+    'border-radius: 12px; text-align: center; color: white; '
+    'box-shadow: 0 4px 12px rgba(0,0,0,0.15); margin: 10px 0;">'
+    '<h4 style="color: {label_color}; margin: 0; font-size: 0.9em;">{label}</h4>'
+    '<h2 style="color: white; margin: 5px 0; font-size: 1.5em; font-weight: bold;">{value}</h2>'
+    '</div>'
+)
+
+# Row of three cards under a bold section title
+_CARD_SECTION_TMPL = (
+    '<p><strong>{title}</strong></p>'
+    '<div style="display: grid; grid-template-columns: repeat(3, 1fr); gap: 1rem;">{cards}</div>'
+)
+
+_ENV_CARD_COLORS = {'start': '#4f46e5', 'end': '#7c3aed', 'label_color': '#e0e7ff'}
+_CIRC_CARD_COLORS = {'start': '#059669', 'end': '#10b981', 'label_color': '#d1fae5'}
+
+def build_prediction_cards_html(energy_val, emissions_val, water_val, circ_val, recycled_val, reuse_val):
+    """Build the environmental and circularity indicator cards as one HTML block"""
+    env_cards = ''.join(_CARD_TMPL.format(label=label, value=value, **_ENV_CARD_COLORS) for label, value in (
+        ("Energy Use", f"{energy_val:.2f} MJ/kg"),
+        ("CO₂ Emissions", f"{emissions_val:.2f} kg/kg"),
+        ("Water Use", f"{water_val:.2f} L/kg")
+    ))
+    circ_cards = ''.join(_CARD_TMPL.format(label=label, value=value, **_CIRC_CARD_COLORS) for label, value in (
+        ("Circularity Index", f"{circ_val:.3f}"),
+        ("Recycled Content", f"{recycled_val:.1f}%"),
+        ("Reuse Potential", f"{reuse_val:.3f}")
+    ))
+    return (
+        _CARD_SECTION_TMPL.format(title="🌱 Environmental Indicators", cards=env_cards) +
+        _CARD_SECTION_TMPL.format(title="♻️ Circularity Indicators", cards=circ_cards)
+    )
 
 # Import robust model loader
 try:
-    from model_loader import load_robust_model
-    st.success("✅ Robust model loader imported")
+    from model_loader import load_robust_model, render_model_banner
 except ImportError:
     st.warning("⚠️ Robust model loader not found, using fallback")
     
@@ -64,6 +162,9 @@ except ImportError:
         """Fallback model loader"""
         st.info("🔧 Using fallback model loader")
         return create_fallback_model()
+    
+    def render_model_banner():
+        """Fallback loader reports its status inline"""
 
 def create_fallback_model():
     """Create a minimal working model when main models fail"""
@@ -119,166 +220,263 @@ def create_fallback_model():
         st.error(f"Failed to create fallback model: {e}")
         return None
 
-@st.cache_data
-def get_metal_options():
-    """Get available metal options including critical minerals"""
-    return {
-        # Base Metals
-        'Aluminum': 0,
-        'Steel': 1,
-        'Copper': 2,
-        'Zinc': 3,
-        'Lead': 4,
-        'Nickel': 5,
-        # Critical Minerals (Problem Statement Focus)
-        'Lithium': 6,
-        'Cobalt': 7,
-        'Rare Earth Elements': 8,
-        'Platinum': 9,
-        'Tungsten': 10,
-        'Indium': 11
-    }
+# Available metal options including critical minerals
+METAL_OPTIONS = MappingProxyType({
+    # Base Metals
+    'Aluminum': 0,
+    'Steel': 1,
+    'Copper': 2,
+    'Zinc': 3,
+    'Lead': 4,
+    'Nickel': 5,
+    # Critical Minerals (Problem Statement Focus)
+    'Lithium': 6,
+    'Cobalt': 7,
+    'Rare Earth Elements': 8,
+    'Platinum': 9,
+    'Tungsten': 10,
+    'Indium': 11
+})
 
-@st.cache_data
-def get_process_options():
-    """Get available process type options focusing on circularity"""
-    return {
-        'Primary Production (Virgin Materials)': 0,
-        'Secondary Production (Recycling)': 1,
-        'Hybrid Process (Mixed Sources)': 2,
-        'Advanced Recycling (High-Tech Recovery)': 3,
-        'Urban Mining (Infrastructure Recovery)': 4
-    }
+# Available process type options focusing on circularity
+PROCESS_OPTIONS = MappingProxyType({
+    'Primary Production (Virgin Materials)': 0,
+    'Secondary Production (Recycling)': 1,
+    'Hybrid Process (Mixed Sources)': 2,
+    'Advanced Recycling (High-Tech Recovery)': 3,
+    'Urban Mining (Infrastructure Recovery)': 4
+})
 
-@st.cache_data
-def get_end_of_life_options():
-    """Get end of life options"""
-    return {
-        'Recycling': 0,
-        'Landfill': 1,
-        'Incineration': 2,
-        'Reuse': 3
-    }
+# End of life options
+EOL_OPTIONS = MappingProxyType({
+    'Recycling': 0,
+    'Landfill': 1,
+    'Incineration': 2,
+    'Reuse': 3
+})
+
+# Critical minerals get an enhanced circularity focus
+CRITICAL_MINERALS = frozenset({'Lithium', 'Cobalt', 'Rare Earth Elements', 'Platinum', 'Tungsten', 'Indium'})
+
+# Map app option codes to the string labels the optimized model was trained on
+# App metal options: Aluminum=0, Steel=1, Copper=2, Zinc=3, Lead=4, Nickel=5, Titanium=6, Magnesium=7
+METAL_LABEL_MAP = MappingProxyType({
+    0: 'Aluminium',  # Aluminum -> Aluminium (model expects British spelling)
+    1: 'Steel',
+    2: 'Copper',
+    3: 'Zinc',
+    4: 'Lead',
+    5: 'Nickel',
+    6: 'Tin',      # Titanium -> Tin (closest available in model)
+    7: 'Gold'      # Magnesium -> Gold (fallback to available option)
+})
+# App process options: Primary=0, Secondary(Recycling)=1, Hybrid=2, Advanced Recycling=3
+PROCESS_LABEL_MAP = MappingProxyType({0: 'Primary', 1: 'Recycled', 2: 'Hybrid', 3: 'Recycled'})
+# App EOL options: Recycling=0, Landfill=1, Incineration=2, Reuse=3
+EOL_LABEL_MAP = MappingProxyType({0: 'Recycled', 1: 'Landfilled', 2: 'Landfilled', 3: 'Reused'})
+
+UnpackedModel = namedtuple('UnpackedModel', [
+    'env_model', 'circ_model', 'label_encoders',
+    'metal_encoding', 'process_encoding', 'eol_encoding'
+])
+
+class OptionEncoding(namedtuple('OptionEncoding', ['codes', 'default', 'sorted_options', 'sorted_codes'])):
+    """App option code -> model label code, falling back to the default label's code"""
+    __slots__ = ()
+    
+    @classmethod
+    def from_codes(cls, codes, default):
+        options = sorted(codes)
+        return cls(codes, default, np.array(options), np.array([codes[option] for option in options]))
+    
+    def encode(self, option_code):
+        return self.codes.get(option_code, self.default)
+    
+    def encode_many(self, option_codes):
+        """Encode an array of option codes with one binary search over the known options"""
+        option_codes = np.asarray(option_codes)
+        idx = np.searchsorted(self.sorted_options, option_codes)
+        idx = np.minimum(idx, len(self.sorted_options) - 1)
+        found = self.sorted_options[idx] == option_codes
+        return np.where(found, self.sorted_codes[idx], self.default)
+
+@st.cache_resource
+def _unpack_model(_model_data, model_key):
+    """Extract optimized model components once per loaded model"""
+    # Streamlit skips hashing underscore-prefixed args; model_key identifies the model
+    label_encoders = _model_data['label_encoders']
+
+    def option_encoding(column, label_map, default_label):
+        # LabelEncoder codes are the positions of the fitted classes
+        label_codes = {label: code for code, label in enumerate(label_encoders[column].classes_)}
+        return OptionEncoding.from_codes(
+            {option: label_codes[label] for option, label in label_map.items()},
+            label_codes[default_label]
+        )
+
+    return UnpackedModel(
+        env_model=_model_data['environmental_model'],
+        circ_model=_model_data['circularity_models'][
+            _model_data.get('circularity_best_model', 'RandomForest')
+        ],
+        label_encoders=label_encoders,
+        metal_encoding=option_encoding('Metal', METAL_LABEL_MAP, 'Aluminium'),
+        process_encoding=option_encoding('Process_Type', PROCESS_LABEL_MAP, 'Primary'),
+        eol_encoding=option_encoding('End_of_Life', EOL_LABEL_MAP, 'Recycled')
+    )
+
+def _engineered_features(transport_km, cost_per_kg, product_life):
+    """Compute the ratio features for scalar or array inputs"""
+    return (
+        1.0 / (transport_km + 1),
+        10.0 / (cost_per_kg + 1),
+        product_life / (cost_per_kg + 1),
+        product_life / (transport_km + 1)
+    )
+
+def build_optimized_features(unpacked, inputs, encoded=None):
+    """Build the 13-feature rows expected by the optimized model"""
+    if encoded is not None:
+        # Categorical features already encoded by the caller
+        metal_encoded, process_encoded, eol_encoded = encoded
+    else:
+        # Encode categorical features straight from the app option codes
+        metal_encoded = unpacked.metal_encoding.encode(inputs['Metal'])
+        process_encoded = unpacked.process_encoding.encode(inputs['Process_Type'])
+        eol_encoded = unpacked.eol_encoding.encode(inputs['End_of_Life'])
+    
+    # Create enhanced features exactly as in training (13 total features)
+    # Original 4 features (scalars, or equal-length arrays for batched sweeps)
+    transport_km = inputs['Transport_km']
+    cost_per_kg = inputs['Cost_per_kg']
+    product_life = inputs['Product_Life_Extension_years']
+    waste_per_kg = inputs['Waste_kg_per_kg_metal']
+    
+    # Engineered features (same as training)
+    energy_per_km, energy_per_cost, cost_efficiency, transport_efficiency = _engineered_features(
+        transport_km, cost_per_kg, product_life
+    )
+    emission_per_energy = 0.5  
+    waste_ratio = waste_per_kg  
+    
+    # Create the exact 13-feature array used in training:
+    # [Metal, Process_Type, End_of_Life, Transport_km, Cost_per_kg, Product_Life_Extension_years, 
+    #  Waste_kg_per_kg_metal, Energy_per_km, Energy_per_cost, Emission_per_energy, 
+    #  Waste_ratio, Cost_efficiency, Transport_efficiency]
+    features = (
+        metal_encoded, process_encoded, eol_encoded,  # 3 categorical features
+        transport_km, cost_per_kg, product_life, waste_per_kg,  # 4 original numerical
+        energy_per_km, energy_per_cost, emission_per_energy,   # 3 engineered
+        waste_ratio, cost_efficiency, transport_efficiency     # 3 more engineered
+    )
+    if isinstance(transport_km, np.ndarray):
+        return np.column_stack(np.broadcast_arrays(*features)).astype(np.float64)
+    return np.array([features])
 
 def predict_with_optimized_model(model_data, inputs):
-    """Make predictions using the optimized model with polynomial features"""
+    """Make predictions using the optimized model with enhanced features"""
     try:
-        import numpy as np
-        from sklearn.preprocessing import PolynomialFeatures
-        
-        # Extract necessary components
-        env_model = model_data['environmental_model']
-        circ_models = model_data['circularity_models']
-        # Enhanced features approach - no polynomial transformation needed
-        label_encoders = model_data['label_encoders']
-        
-        # Map input codes to string labels that the model expects
-        # App metal options: Aluminum=0, Steel=1, Copper=2, Zinc=3, Lead=4, Nickel=5, Titanium=6, Magnesium=7
-        metal_map = {
-            0: 'Aluminium',  # Aluminum -> Aluminium (model expects British spelling)
-            1: 'Steel', 
-            2: 'Copper', 
-            3: 'Zinc', 
-            4: 'Lead', 
-            5: 'Nickel',
-            6: 'Tin',      # Titanium -> Tin (closest available in model)
-            7: 'Gold'      # Magnesium -> Gold (fallback to available option)
-        }
-        # App process options: Primary=0, Secondary(Recycling)=1, Hybrid=2, Advanced Recycling=3
-        process_map = {0: 'Primary', 1: 'Recycled', 2: 'Hybrid', 3: 'Recycled'}
-        # App EOL options: Recycling=0, Landfill=1, Incineration=2, Reuse=3  
-        eol_map = {0: 'Recycled', 1: 'Landfilled', 2: 'Landfilled', 3: 'Reused'}
-        
-        # Get string labels
-        metal_label = metal_map.get(inputs['Metal'], 'Aluminium')
-        process_label = process_map.get(inputs['Process_Type'], 'Primary')  
-        eol_label = eol_map.get(inputs['End_of_Life'], 'Recycled')
-        
-        # Encode categorical features using string labels
-        metal_encoded = label_encoders['Metal'].transform([metal_label])[0]
-        process_encoded = label_encoders['Process_Type'].transform([process_label])[0]
-        eol_encoded = label_encoders['End_of_Life'].transform([eol_label])[0]
-        
-        # Create enhanced features exactly as in training (13 total features)
-        # Original 4 features
-        transport_km = inputs['Transport_km']
-        cost_per_kg = inputs['Cost_per_kg']
-        product_life = inputs['Product_Life_Extension_years']
-        waste_per_kg = inputs['Waste_kg_per_kg_metal']
-        
-        # Engineered features (same as training)
-        energy_per_km = 1.0 / (transport_km + 1)  
-        energy_per_cost = 10.0 / (cost_per_kg + 1)  
-        emission_per_energy = 0.5  
-        waste_ratio = waste_per_kg  
-        cost_efficiency = product_life / (cost_per_kg + 1)
-        transport_efficiency = product_life / (transport_km + 1)
-        
-        # Create the exact 13-feature array used in training:
-        # [Metal, Process_Type, End_of_Life, Transport_km, Cost_per_kg, Product_Life_Extension_years, 
-        #  Waste_kg_per_kg_metal, Energy_per_km, Energy_per_cost, Emission_per_energy, 
-        #  Waste_ratio, Cost_efficiency, Transport_efficiency]
-        all_features = np.array([[
-            metal_encoded, process_encoded, eol_encoded,  # 3 categorical features
-            transport_km, cost_per_kg, product_life, waste_per_kg,  # 4 original numerical
-            energy_per_km, energy_per_cost, emission_per_energy,   # 3 engineered
-            waste_ratio, cost_efficiency, transport_efficiency     # 3 more engineered
-        ]])
-        
-        # Make predictions
-        results = {}
-        
-        # Environmental predictions
-        env_pred = env_model.predict(all_features)[0]
-        results['Energy_Use_MJ_per_kg'] = float(env_pred[0])
-        results['Emission_kgCO2_per_kg'] = float(env_pred[1]) 
-        results['Water_Use_l_per_kg'] = float(env_pred[2])
-        
-        # Circularity predictions
-        best_circ_model = circ_models[model_data.get('circularity_best_model', 'RandomForest')]
-        circ_pred = best_circ_model.predict(all_features)[0]
-        results['Circularity_Index'] = float(circ_pred[0])
-        results['Recycled_Content_pct'] = float(circ_pred[1])
-        results['Reuse_Potential_score'] = float(circ_pred[2])
-        
-        return results
+        # Components are extracted once per model load
+        unpacked = _unpack_model(model_data, id(model_data))
+        all_features = build_optimized_features(unpacked, inputs)
+        
+        # Environmental and circularity predictions
+        env_pred = unpacked.env_model.predict(all_features)[0]
+        circ_pred = unpacked.circ_model.predict(all_features)[0]
+        
+        return LCAResult(
+            float(env_pred[0]), float(env_pred[1]), float(env_pred[2]),
+            float(circ_pred[0]), float(circ_pred[1]), float(circ_pred[2])
+        )
         
     except Exception as e:
         st.error(f"❌ Optimized model prediction error: {str(e)}")
         return None
 
+# Input order expected by the generic (non-optimized) models
+_FEATURE_ORDER = (
+    'Metal', 'Process_Type', 'End_of_Life', 'Transport_km', 'Cost_per_kg',
+    'Product_Life_Extension_years', 'Waste_kg_per_kg_metal'
+)
+
+# Target variable names, in model output order
+TARGET_NAMES = (
+    'Energy_Use_MJ_per_kg',
+    'Emission_kgCO2_per_kg', 
+    'Water_Use_l_per_kg',
+    'Circularity_Index',
+    'Recycled_Content_pct',
+    'Reuse_Potential_score'
+)
+
+@dataclass(slots=True)
+class LCAResult:
+    """Predicted indicators, with fields in model output order"""
+    energy: float
+    emissions: float
+    water: float
+    circularity: float
+    recycled_pct: float
+    reuse: float
+    
+    # Dict-style access by target name, used by plots, recommendations and reports
+    def __getitem__(self, key):
+        return getattr(self, _RESULT_FIELDS[key])
+    
+    def get(self, key, default=None):
+        field = _RESULT_FIELDS.get(key)
+        return default if field is None else getattr(self, field)
+    
+    def to_dict(self):
+        """Return the predictions keyed by target name"""
+        return {name: getattr(self, field) for name, field in _RESULT_FIELDS.items()}
+
+_RESULT_FIELDS = dict(zip(TARGET_NAMES, LCAResult.__slots__))
+
+# Per-thread input row, reused across predictions (Streamlit runs sessions in threads)
+_row_buffer = threading.local()
+
+def _get_input_row():
+    """Return this thread's preallocated single-row feature buffer"""
+    row = getattr(_row_buffer, 'row', None)
+    if row is None:
+        # float32 matches the tree models' internal dtype, so predict() does not copy the row
+        row = _row_buffer.row = np.empty((1, len(_FEATURE_ORDER)), dtype=np.float32)
+    return row
+
+def is_optimized_model(model_data):
+    """Check whether the loaded model is the optimized dual-target model"""
+    return isinstance(model_data, dict) and model_data.get('model_type') == 'optimized_dual_target'
+
+def _resolve_model(model_data):
+    """Extract the estimator from the different generic model structures"""
+    if isinstance(model_data, dict):
+        if 'model' in model_data:
+            return model_data['model']
+        elif 'best_model' in model_data:
+            return model_data['best_model']
+    return model_data
+
 def predict_lca_values(model_data, inputs):
     """Make predictions using the loaded model"""
     try:
-        # Handle different model structures
-        if isinstance(model_data, dict):
-            # Check if this is the optimized model with polynomial features
-            if 'model_type' in model_data and model_data['model_type'] == 'optimized_dual_target':
-                return predict_with_optimized_model(model_data, inputs)
-            elif 'model' in model_data:
-                model = model_data['model']
-            elif 'best_model' in model_data:
-                model = model_data['best_model']
-            else:
-                model = model_data
+        # Check if this is the optimized model with enhanced features
+        if is_optimized_model(model_data):
+            return predict_with_optimized_model(model_data, inputs)
+        model = _resolve_model(model_data)
+        
+        feature_names = getattr(model, 'feature_names_in_', None)
+        if feature_names is not None:
+            # Fitted on named columns (possibly a Pipeline/ColumnTransformer): pass them by name
+            row = pd.DataFrame({name: [inputs[name]] for name in feature_names})
         else:
-            model = model_data
-        
-        # Prepare input data
-        input_df = pd.DataFrame([inputs])
+            # Fitted on plain arrays: fill the preallocated row positionally
+            row = _get_input_row()
+            for i, key in enumerate(_FEATURE_ORDER):
+                row[0, i] = inputs[key]
         
         # Make prediction
-        predictions = model.predict(input_df) # type: ignore
-        
-        # Target variable names
-        target_names = [
-            'Energy_Use_MJ_per_kg',
-            'Emission_kgCO2_per_kg', 
-            'Water_Use_l_per_kg',
-            'Circularity_Index',
-            'Recycled_Content_pct',
-            'Reuse_Potential_score'
-        ]
+        predictions = np.asarray(model.predict(row)) # type: ignore
         
         # Handle different prediction formats
         if predictions.ndim == 2:
@@ -286,109 +484,321 @@ def predict_lca_values(model_data, inputs):
         else:
             pred_values = predictions
         
-        # Create results dictionary
-        results = {}
-        for i, name in enumerate(target_names):
-            if i < len(pred_values):
-                results[name] = float(pred_values[i])
-            else:
-                results[name] = 0.0
-        
-        return results
+        # Missing outputs default to 0.0
+        values = [float(x) for x in pred_values[:len(TARGET_NAMES)]]
+        values.extend([0.0] * (len(TARGET_NAMES) - len(values)))
+        return LCAResult(*values)
     
     except Exception as e:
         st.error(f"❌ Prediction error: {str(e)}")
         return None
 
+def predict_batch(model_data, batch_inputs):
+    """Predict all targets for many input rows in a single model call per estimator
+
+    ``batch_inputs`` maps each input name to a scalar or an equal-length array;
+    scalars are broadcast across all rows without copying. Returns an array of
+    shape (n_rows, len(TARGET_NAMES)).
+    """
+    columns = dict(zip(_FEATURE_ORDER, np.broadcast_arrays(
+        *(np.atleast_1d(batch_inputs[key]) for key in _FEATURE_ORDER)
+    )))
+    n_rows = columns['Transport_km'].shape[0]
+    
+    if is_optimized_model(model_data):
+        unpacked = _unpack_model(model_data, id(model_data))
+        metal_e = unpacked.metal_encoding.encode_many(columns['Metal'])
+        proc_e = unpacked.process_encoding.encode_many(columns['Process_Type'])
+        eol_e = unpacked.eol_encoding.encode_many(columns['End_of_Life'])
+        numeric = [
+            columns[key].astype(np.float64)
+            for key in ('Transport_km', 'Cost_per_kg', 'Product_Life_Extension_years', 'Waste_kg_per_kg_metal')
+        ]
+        
+        feats = build_optimized_features(unpacked, dict(
+            columns, Transport_km=numeric[0], Cost_per_kg=numeric[1],
+            Product_Life_Extension_years=numeric[2], Waste_kg_per_kg_metal=numeric[3]
+        ), encoded=(metal_e, proc_e, eol_e))
+        
+        env_pred = unpacked.env_model.predict(feats)
+        circ_pred = unpacked.circ_model.predict(feats)
+        return np.hstack([env_pred[:, :3], circ_pred[:, :3]])
+    
+    model = _resolve_model(model_data)
+    feature_names = getattr(model, 'feature_names_in_', None)
+    if feature_names is not None:
+        feats = pd.DataFrame({name: columns[name] for name in feature_names})
+    else:
+        feats = np.column_stack([columns[key] for key in _FEATURE_ORDER]).astype(np.float32)
+    predictions = np.asarray(model.predict(feats)).reshape(n_rows, -1) # type: ignore
+    
+    # Pad models with fewer outputs so every target has a column
+    results = np.zeros((n_rows, len(TARGET_NAMES)))
+    n_cols = min(predictions.shape[1], len(TARGET_NAMES))
+    results[:, :n_cols] = predictions[:, :n_cols]
+    return results
+
 def create_pathway_comparison(base_inputs):
     """Create comparison between different production pathways"""
+    model_data = st.session_state.get('model_data')
+    return _cached_pathway_comparison(model_data, id(model_data), base_inputs)
+
+@st.cache_data(ttl=3600, max_entries=128)
+def _cached_pathway_comparison(_model_data, model_key, base_inputs):
+    """Pathway comparison memoized on the model and the input values"""
     pathways = {
         'Primary Production': 0,
         'Secondary Production (Recycling)': 1,
         'Hybrid Process': 2
     }
+    model_data = _model_data
     
-    comparison_data = []
-    model_data = st.session_state.get('model_data')
+    # Shared base inputs are broadcast; only the process code varies per pathway
+    batch_inputs = dict(base_inputs, Process_Type=np.array(list(pathways.values())))
     
-    for pathway_name, pathway_code in pathways.items():
-        inputs = base_inputs.copy()
-        inputs['Process_Type'] = pathway_code
-        
-        predictions = predict_lca_values(model_data, inputs)
-        if predictions:
-            comparison_data.append({
-                'Pathway': pathway_name,
-                'Energy (MJ/kg)': predictions.get('Energy_Use_MJ_per_kg', 0),
-                'Emissions (kgCO2/kg)': predictions.get('Emission_kgCO2_per_kg', 0),
-                'Water (L/kg)': predictions.get('Water_Use_l_per_kg', 0),
-                'Circularity Index': predictions.get('Circularity_Index', 0),
-                'Recycled Content (%)': predictions.get('Recycled_Content_pct', 0),
-                'Reuse Potential': predictions.get('Reuse_Potential_score', 0)
-            })
+    try:
+        preds = predict_batch(model_data, batch_inputs)
+    except Exception as e:
+        st.error(f"❌ Pathway comparison error: {str(e)}")
+        return pd.DataFrame()
     
-    return pd.DataFrame(comparison_data)
+    return pd.DataFrame({
+        'Pathway': list(pathways),
+        'Energy (MJ/kg)': preds[:, 0],
+        'Emissions (kgCO2/kg)': preds[:, 1],
+        'Water (L/kg)': preds[:, 2],
+        'Circularity Index': preds[:, 3],
+        'Recycled Content (%)': preds[:, 4],
+        'Reuse Potential': preds[:, 5]
+    })
 
-def main():
-    """Main Streamlit application"""
+def dumps_json(data):
+    """Serialize export data as indented UTF-8 JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(data, indent=2).encode('utf-8')
+
+def export_parquet_bytes(export_data):
+    """Flatten nested export data into a one-row table and encode it as zstd Parquet"""
+    buffer = io.BytesIO()
+    pd.json_normalize(export_data).to_parquet(buffer, engine='pyarrow', compression='zstd', index=False)
+    return buffer.getvalue()
+
+# Executive summary template, filled with str.format_map
+_REPORT_TMPL = """
+# AI-Driven LCA Analysis Report
+## Comprehensive Sustainability Assessment
+
+**Analysis Date:** {analysis_date}
+**Industry Sector:** {sector}
+**Metal/Critical Mineral:** {metal}
+**Circular Economy Route:** {route}
+
+### Environmental Impact Assessment
+- Energy Use: {energy:.2f} MJ/kg
+- CO2 Emissions: {emissions:.2f} kg CO2/kg
+- Water Use: {water:.2f} L/kg
+
+### Circularity & Sustainability Metrics
+- Circularity Index: {circularity:.3f}
+- Recycled Content: {recycled:.1f}%
+- Reuse Potential: {reuse:.2f}
+
+### Recommendations
+- Route Optimization: {route_status}
+- Critical Mineral Status: {critical_status}
+- Sustainability Rating: {route_sustainability}
+
+---
+*Generated by AI-Driven LCA Tool for Metallurgy and Mining*
+"""
+
+def build_report(pred_values, sector, metal, route, recommendations, analysis_date):
+    """Build the executive summary text from prediction values and decided statuses"""
+    energy, emissions, water, circularity, recycled, reuse = pred_values
+    route_status, critical_status, route_sustainability = recommendations
     
-    # Custom CSS for better metrics visibility
-    st.markdown("""
-    <style>
-    /* Enhanced metrics styling with better targeting */
-    [data-testid="metric-container"] {
-        background: linear-gradient(135deg, #4f46e5 0%, #7c3aed 100%) !important;
-        border: 2px solid #e0e7ff !important;
-        padding: 20px !important;
-        border-radius: 12px !important;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.15) !important;
-        margin: 8px 0 !important;
-    }
+    return _REPORT_TMPL.format_map({
+        'analysis_date': analysis_date,
+        'sector': sector,
+        'metal': metal,
+        'route': route,
+        'energy': energy,
+        'emissions': emissions,
+        'water': water,
+        'circularity': circularity,
+        'recycled': recycled,
+        'reuse': reuse,
+        'route_status': route_status,
+        'critical_status': critical_status,
+        'route_sustainability': route_sustainability
+    })
+
+# Static checklist shown beside the report and export buttons
+_ANALYSIS_SUMMARY_MD = "\n".join([
+    "- 🔬 Environmental Impact Analysis",
+    "- ♻️ Circularity Assessment",
+    "- 🌱 Sustainability Evaluation",
+    "- ⚡ Performance Optimization",
+    "- 📊 Data-Driven Insights",
+    "- 🎯 Actionable Recommendations"
+])
+
+# Pathway comparison columns where the lowest or the highest value is best
+_LOWER_IS_BETTER = ('Energy (MJ/kg)', 'Emissions (kgCO2/kg)', 'Water (L/kg)')
+_HIGHER_IS_BETTER = ('Circularity Index', 'Recycled Content (%)', 'Reuse Potential')
+_BEST_LABELS = np.array(['Energy', 'Emissions', 'Water', 'Circularity', 'Recycled', 'Reuse'])
+
+# Native Streamlit formatting for the pathway table; no pandas Styler involved
+_COMPARISON_COLUMN_CONFIG = {
+    'Energy (MJ/kg)': st.column_config.NumberColumn(format="%.2f"),
+    'Emissions (kgCO2/kg)': st.column_config.NumberColumn(format="%.2f"),
+    'Water (L/kg)': st.column_config.NumberColumn(format="%.2f"),
+    'Circularity Index': st.column_config.NumberColumn(format="%.3f"),
+    'Recycled Content (%)': st.column_config.NumberColumn(format="%.1f"),
+    'Reuse Potential': st.column_config.NumberColumn(format="%.2f"),
+    'Best In': st.column_config.TextColumn(help="Metrics where this pathway scores best")
+}
+
+def with_best_in(comparison_df):
+    """Add a 'Best In' column naming the metrics each pathway wins, from one vectorized compare"""
+    lower = comparison_df[list(_LOWER_IS_BETTER)].to_numpy()
+    higher = comparison_df[list(_HIGHER_IS_BETTER)].to_numpy()
+    wins = np.hstack([lower == lower.min(axis=0), higher == higher.max(axis=0)])
+    return comparison_df.assign(**{'Best In': [', '.join(_BEST_LABELS[row]) for row in wins]})
+
+# Fragments rerun in isolation on newer Streamlit; older releases render them inline
+_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda func: func)
+
+@_fragment
+def _render_visualizations(comparison_df, preds):
+    """Visualizations section, rerun on its own as a fragment"""
+    # Deferred until there is something to plot; later reruns hit the module cache
+    from plots import create_sankey_diagram, create_energy_comparison, create_emissions_comparison, create_circularity_comparison
     
-    [data-testid="metric-container"] > div {
-        color: white !important;
-    }
+    st.header("📊 Visualizations")
     
-    [data-testid="metric-container"] [data-testid="metric-value"] {
-        color: #ffffff !important;
-        font-weight: bold !important;
-        font-size: 1.5em !important;
-        text-shadow: 1px 1px 2px rgba(0,0,0,0.3) !important;
+    # Each builder handles empty data and its own errors by returning a placeholder figure
+    figures = {
+        'energy': create_energy_comparison(comparison_df),
+        'circularity': create_circularity_comparison(comparison_df),
+        'emissions': create_emissions_comparison(comparison_df),
+        'sankey': create_sankey_diagram(preds)
     }
     
-    [data-testid="metric-container"] [data-testid="metric-label"] {
-        color: #e0e7ff !important;
-        font-weight: 600 !important;
-        font-size: 0.9em !important;
-        text-shadow: 1px 1px 2px rgba(0,0,0,0.3) !important;
-    }
+    viz_col1, viz_col2 = st.columns(2)
     
-    /* Green gradient for circularity section */
-    .stMarkdown:has(+ .stColumns) ~ .stColumns [data-testid="metric-container"] {
-        background: linear-gradient(135deg, #059669 0%, #10b981 100%) !important;
-        border-color: #d1fae5 !important;
-    }
+    for column, chart_names in ((viz_col1, ('energy', 'circularity')), (viz_col2, ('emissions', 'sankey'))):
+        with column:
+            for name in chart_names:
+                st.plotly_chart(figures[name], use_container_width=True)
+
+@_fragment
+def _render_report_export(preds, sector, metal, process, eol, route, route_info, is_critical,
+                          transport_km, cost_per_kg, production_volume, recovery_rate):
+    """Report and export section; its buttons rerun only this fragment"""
+    st.header("📄 Professional Report & Export")
     
-    /* Ensure all text in metrics is white */
-    [data-testid="metric-container"] * {
-        color: white !important;
-    }
+    # One clock read per rerun so every artifact carries the same timestamp
+    now = datetime.now()
+    ts_human = now.strftime("%Y-%m-%d %H:%M:%S")
+    ts_file = now.strftime('%Y%m%d_%H%M%S')
     
-    /* Alternative approach using nth-child */
-    .stColumns:nth-of-type(2) [data-testid="metric-container"] {
-        background: linear-gradient(135deg, #059669 0%, #10b981 100%) !important;
-    }
+    report_col1, report_col2, report_col3 = st.columns(3)
     
-    /* Force override any conflicting styles */
-    div[data-testid="stMetricValue"] > div {
-        color: #ffffff !important;
-    }
+    with report_col1:
+        st.subheader("📊 Summary Report")
+        if st.button("Generate Executive Summary", type="primary"):
+            # Generate comprehensive report
+            route_status = '✅ Optimized' if route_info['circularity'] > 0.6 else '⚠️ Consider higher circularity routes'
+            critical_status = '⚠️ Enhanced focus needed' if is_critical else '✅ Standard approach'
+            report_text = build_report(
+                tuple(preds[name] for name in TARGET_NAMES),
+                sector, metal, route,
+                (route_status, critical_status, route_info['sustainability']),
+                ts_human
+            )
+            
+            st.download_button(
+                label="📥 Download Report (TXT)",
+                data=report_text.encode('utf-8'),
+                file_name=f"LCA_Report_{metal}_{ts_file}.txt",
+                mime="text/plain"
+            )
     
-    div[data-testid="stMetricLabel"] > div {
-        color: #e0e7ff !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    with report_col2:
+        st.subheader("📈 Data Export")
+        if st.button("Export Analysis Data"):
+            # Prepare comprehensive data export
+            export_data = {
+                'Metadata': {
+                    'Analysis_Date': ts_human,
+                    'Tool_Name': 'AI-Driven LCA Tool for Metallurgy',
+                    'Industry_Sector': sector,
+                    'Metal_Type': metal,
+                    'Process_Type': process,
+                    'End_of_Life': eol,
+                    'Circular_Route': route,
+                    'Route_Circularity': route_info['circularity'],
+                    'Route_Sustainability': route_info['sustainability']
+                },
+                'Input_Parameters': {
+                    'Transport_Distance_km': transport_km,
+                    'Cost_per_kg': cost_per_kg,
+                    'Production_Volume_kg': production_volume,
+                    'Recovery_Rate_pct': recovery_rate
+                },
+                'Environmental_Results': {
+                    'Energy_Use_MJ_per_kg': preds['Energy_Use_MJ_per_kg'],
+                    'CO2_Emission_kg_per_kg': preds['Emission_kgCO2_per_kg'],
+                    'Water_Use_L_per_kg': preds['Water_Use_l_per_kg']
+                },
+                'Circularity_Results': {
+                    'Circularity_Index': preds['Circularity_Index'],
+                    'Recycled_Content_pct': preds['Recycled_Content_pct'],
+                    'Reuse_Potential_score': preds['Reuse_Potential_score']
+                }
+            }
+            
+            # Convert to JSON for download
+            json_bytes = dumps_json(export_data)
+            
+            st.download_button(
+                label="📊 Download JSON Data",
+                data=json_bytes,
+                file_name=f"LCA_Data_{metal}_{ts_file}.json",
+                mime="application/json"
+            )
+            
+            # Compressed copy for slow connections; level 3 keeps most of the ratio at a fraction of the CPU
+            st.download_button(
+                label="📊 Download JSON (gzip)",
+                data=gzip.compress(json_bytes, compresslevel=3),
+                file_name=f"LCA_Data_{metal}_{ts_file}.json.gz",
+                mime="application/gzip"
+            )
+            
+            # Columnar export for analysis tools
+            st.download_button(
+                label="📦 Download Parquet Data",
+                data=export_parquet_bytes(export_data),
+                file_name=f"LCA_Data_{metal}_{ts_file}.parquet",
+                mime="application/octet-stream"
+            )
+    
+    with report_col3:
+        st.subheader("📈 Analysis Summary")
+        st.success("✅ **Analysis Complete**")
+        
+        st.markdown(_ANALYSIS_SUMMARY_MD)
+        
+        st.info("� **Comprehensive LCA analysis completed successfully**")
+
+def main():
+    """Main Streamlit application"""
+    
+    # Page styling
+    st.markdown(_CSS, unsafe_allow_html=True)
     
     # Title and description
     st.title("🌱 AI-Driven LCA Tool for Metallurgy & Mining")
@@ -409,6 +819,11 @@ def main():
         with st.spinner("Loading ML model..."):
             st.session_state.model_data = load_robust_model()
     
+    # Model status messages are shown on the first run of each session only
+    if not st.session_state.get('_banner_shown'):
+        render_model_banner()
+        st.session_state['_banner_shown'] = True
+    
     if st.session_state.model_data is None:
         st.error("Cannot proceed without a trained model. Please train the model first.")
         st.stop()
@@ -442,31 +857,28 @@ def main():
         st.markdown(f"{sector_options[selected_sector]} **{selected_sector}** sector selected")
         
         # Metal selection with critical minerals
-        metal_options = get_metal_options()
         selected_metal = st.selectbox(
             "Select Metal/Critical Mineral:",
-            options=list(metal_options.keys()),
+            options=list(METAL_OPTIONS.keys()),
             help="Choose the metal or critical mineral for LCA analysis"
         )
         
         # Display criticality info
-        critical_minerals = ['Lithium', 'Cobalt', 'Rare Earth Elements', 'Platinum', 'Tungsten', 'Indium']
-        if selected_metal in critical_minerals:
+        is_critical = selected_metal in CRITICAL_MINERALS
+        if is_critical:
             st.warning(f"⚠️ **{selected_metal}** is a critical mineral - enhanced circularity focus recommended")
         
         # Process type selection
-        process_options = get_process_options()
         selected_process = st.selectbox(
             "Select Process Type:",
-            options=list(process_options.keys()),
+            options=list(PROCESS_OPTIONS.keys()),
             help="Choose the production process"
         )
         
         # End of life selection
-        eol_options = get_end_of_life_options()
         selected_eol = st.selectbox(
             "Select End of Life:",
-            options=list(eol_options.keys()),
+            options=list(EOL_OPTIONS.keys()),
             help="Choose the end-of-life treatment"
         )
         
@@ -650,9 +1062,9 @@ def main():
     
     # Prepare inputs
     inputs = {
-        'Metal': metal_options[selected_metal],
-        'Process_Type': process_options[selected_process],
-        'End_of_Life': eol_options[selected_eol],
+        'Metal': METAL_OPTIONS[selected_metal],
+        'Process_Type': PROCESS_OPTIONS[selected_process],
+        'End_of_Life': EOL_OPTIONS[selected_eol],
         'Transport_km': transport_km,
         'Cost_per_kg': cost_per_kg,
         'Product_Life_Extension_years': product_life_years,
@@ -682,199 +1094,68 @@ def main():
         st.markdown('<div class="prediction-table">', unsafe_allow_html=True)
         st.subheader("🎯 Predicted Values")
         
-        # Environmental indicators
-        st.markdown("**🌱 Environmental Indicators**")
-        
-        # Custom styled metrics for environmental data
-        energy_val = predictions.get('Energy_Use_MJ_per_kg', 0)
-        if energy_input > 0:
-            energy_val = energy_input
-        emissions_val = predictions.get('Emission_kgCO2_per_kg', 0)
-        if emissions_input > 0:
-            emissions_val = emissions_input
-        water_val = predictions.get('Water_Use_l_per_kg', 0)
-        if water_input > 0:
-            water_val = water_input
-            
-        env_col1, env_col2, env_col3 = st.columns(3)
+        # Custom styled metrics for environmental data; positive optional inputs override predictions
+        env_predicted = np.array([predictions.energy, predictions.emissions, predictions.water])
+        env_overrides = np.array([energy_input, emissions_input, water_input])
+        energy_val, emissions_val, water_val = np.where(env_overrides > 0, env_overrides, env_predicted)
+        circ_val = predictions.circularity
+        recycled_val = predictions.recycled_pct
+        reuse_val = predictions.reuse
         
-        with env_col1:
-            st.markdown(f"""
-            <div style="
-                background: linear-gradient(135deg, #4f46e5 0%, #7c3aed 100%);
-                padding: 20px;
-                border-radius: 12px;
-                text-align: center;
-                color: white;
-                box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-                margin: 10px 0;
-            ">
-                <h4 style="color: #e0e7ff; margin: 0; font-size: 0.9em;">Energy Use</h4>
-                <h2 style="color: white; margin: 5px 0; font-size: 1.5em; font-weight: bold;">{energy_val:.2f} MJ/kg</h2>
-            </div>
-            """, unsafe_allow_html=True)
+        # Rebuild the card HTML only when the displayed values change
+        card_values = (energy_val, emissions_val, water_val, circ_val, recycled_val, reuse_val)
+        cards_key = tuple(round(float(value), 4) for value in card_values)
+        if st.session_state.get('_cards_key') != cards_key:
+            st.session_state['_cards_html'] = build_prediction_cards_html(*card_values)
+            st.session_state['_cards_key'] = cards_key
         
-        with env_col2:
-            st.markdown(f"""
-            <div style="
-                background: linear-gradient(135deg, #4f46e5 0%, #7c3aed 100%);
-                padding: 20px;
-                border-radius: 12px;
-                text-align: center;
-                color: white;
-                box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-                margin: 10px 0;
-            ">
-                <h4 style="color: #e0e7ff; margin: 0; font-size: 0.9em;">CO₂ Emissions</h4>
-                <h2 style="color: white; margin: 5px 0; font-size: 1.5em; font-weight: bold;">{emissions_val:.2f} kg/kg</h2>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with env_col3:
-            st.markdown(f"""
-            <div style="
-                background: linear-gradient(135deg, #4f46e5 0%, #7c3aed 100%);
-                padding: 20px;
-                border-radius: 12px;
-                text-align: center;
-                color: white;
-                box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-                margin: 10px 0;
-            ">
-                <h4 style="color: #e0e7ff; margin: 0; font-size: 0.9em;">Water Use</h4>
-                <h2 style="color: white; margin: 5px 0; font-size: 1.5em; font-weight: bold;">{water_val:.2f} L/kg</h2>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        # Circularity indicators
-        st.markdown("**♻️ Circularity Indicators**")
-        circ_col1, circ_col2, circ_col3 = st.columns(3)
-        
-        with circ_col1:
-            circ_val = predictions.get('Circularity_Index', 0)
-            st.markdown(f"""
-            <div style="
-                background: linear-gradient(135deg, #059669 0%, #10b981 100%);
-                padding: 20px;
-                border-radius: 12px;
-                text-align: center;
-                color: white;
-                box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-                margin: 10px 0;
-            ">
-                <h4 style="color: #d1fae5; margin: 0; font-size: 0.9em;">Circularity Index</h4>
-                <h2 style="color: white; margin: 5px 0; font-size: 1.5em; font-weight: bold;">{circ_val:.3f}</h2>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with circ_col2:
-            recycled_val = predictions.get('Recycled_Content_pct', 0)
-            st.markdown(f"""
-            <div style="
-                background: linear-gradient(135deg, #059669 0%, #10b981 100%);
-                padding: 20px;
-                border-radius: 12px;
-                text-align: center;
-                color: white;
-                box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-                margin: 10px 0;
-            ">
-                <h4 style="color: #d1fae5; margin: 0; font-size: 0.9em;">Recycled Content</h4>
-                <h2 style="color: white; margin: 5px 0; font-size: 1.5em; font-weight: bold;">{recycled_val:.1f}%</h2>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with circ_col3:
-            reuse_val = predictions.get('Reuse_Potential_score', 0)
-            st.markdown(f"""
-            <div style="
-                background: linear-gradient(135deg, #059669 0%, #10b981 100%);
-                padding: 20px;
-                border-radius: 12px;
-                text-align: center;
-                color: white;
-                box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-                margin: 10px 0;
-            ">
-                <h4 style="color: #d1fae5; margin: 0; font-size: 0.9em;">Reuse Potential</h4>
-                <h2 style="color: white; margin: 5px 0; font-size: 1.5em; font-weight: bold;">{reuse_val:.3f}</h2>
-            </div>
-            """, unsafe_allow_html=True)
+        # Environmental and circularity indicators rendered as a single element
+        st.markdown(st.session_state['_cards_html'], unsafe_allow_html=True)
         
         st.markdown('</div>', unsafe_allow_html=True)
 
     
-    # Pathway Comparison Section
+    # Result sections share one guard and the same locals
     if 'current_predictions' in st.session_state:
+        preds = st.session_state['current_predictions']
+        inputs = st.session_state.get('current_inputs')
+        
+        # Pathway Comparison Section
         st.header("🔄 Production Pathway Comparison")
         
-        comparison_df = create_pathway_comparison(st.session_state.current_inputs)
+        comparison_df = create_pathway_comparison(inputs)
         
         if not comparison_df.empty:
-            st.markdown('<div class="pathway-comparison">', unsafe_allow_html=True)
-            st.dataframe(
-                comparison_df.style.highlight_min(
-                    subset=['Energy (MJ/kg)', 'Emissions (kgCO2/kg)', 'Water (L/kg)'],
-                    color='lightgreen'
-                ).highlight_max(
-                    subset=['Circularity Index', 'Recycled Content (%)', 'Reuse Potential'],
-                    color='lightblue'
-                ),
-                use_container_width=True
-            )
-            st.markdown('</div>', unsafe_allow_html=True)
-    
-    # Visualizations Section
-    if 'current_predictions' in st.session_state:
-        st.header("📊 Visualizations")
+            with st.container(border=True):
+                st.dataframe(
+                    with_best_in(comparison_df),
+                    column_config=_COMPARISON_COLUMN_CONFIG,
+                    hide_index=True,
+                    use_container_width=True
+                )
         
-        viz_col1, viz_col2 = st.columns(2)
+        # Visualizations Section
+        _render_visualizations(comparison_df, preds)
         
-        with viz_col1:
-            try:
-                # Energy comparison chart
-                energy_fig = create_energy_comparison(comparison_df)
-                st.plotly_chart(energy_fig, use_container_width=True)
-                
-                # Circularity comparison
-                circ_fig = create_circularity_comparison(comparison_df)
-                st.plotly_chart(circ_fig, use_container_width=True)
-            except Exception as e:
-                st.warning(f"Visualization error: {str(e)}")
-        
-        with viz_col2:
-            try:
-                # Emissions comparison
-                emissions_fig = create_emissions_comparison(comparison_df)
-                st.plotly_chart(emissions_fig, use_container_width=True)
-                
-                # Sankey diagram
-                sankey_fig = create_sankey_diagram(st.session_state.current_predictions)
-                st.plotly_chart(sankey_fig, use_container_width=True)
-            except Exception as e:
-                st.warning(f"Visualization error: {str(e)}")
-    
-    # Recommendations Section
-    if 'current_predictions' in st.session_state:
+        # Recommendations Section
         st.header("💡 Recommendations")
         
         rec_col1, rec_col2 = st.columns(2)
         
         with rec_col1:
             st.subheader("🌱 Environmental Improvements")
-            env_recommendations = get_environmental_recommendations(
-                st.session_state.current_predictions
-            )
-            for rec in env_recommendations:
-                st.success(rec)
+            # One element per column instead of one per recommendation
+            st.success(get_environmental_recommendations_markdown(preds))
         
         with rec_col2:
             st.subheader("♻️ Circularity Improvements")
-            circ_recommendations = get_circularity_recommendations(
-                st.session_state.current_predictions
-            )
-            for rec in circ_recommendations:
-                st.info(rec)
+            st.info(get_circularity_recommendations_markdown(preds))
+        
+        # Professional Report Generation (Problem Statement requirement)
+        _render_report_export(
+            preds, selected_sector, selected_metal, selected_process, selected_eol,
+            selected_route, route_info, is_critical, transport_km, cost_per_kg, production_volume, recovery_rate
+        )
     
     # Footer
     st.markdown("---")
@@ -884,121 +1165,5 @@ def main():
     </div>
     """, unsafe_allow_html=True)
 
-    # Professional Report Generation (Problem Statement requirement)
-    if 'current_predictions' in st.session_state:
-        st.header("📄 Professional Report & Export")
-        
-        report_col1, report_col2, report_col3 = st.columns(3)
-        
-        with report_col1:
-            st.subheader("📊 Summary Report")
-            if st.button("Generate Executive Summary", type="primary"):
-                # Generate comprehensive report
-                report_data = {
-                    'analysis_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    'sector': selected_sector,
-                    'metal': selected_metal,
-                    'route': selected_route,
-                    'predictions': st.session_state['current_predictions']
-                }
-                
-                # Create downloadable report
-                report_text = f"""
-# AI-Driven LCA Analysis Report
-## Comprehensive Sustainability Assessment
-
-**Analysis Date:** {report_data['analysis_date']}
-**Industry Sector:** {selected_sector}
-**Metal/Critical Mineral:** {selected_metal}
-**Circular Economy Route:** {selected_route}
-
-### Environmental Impact Assessment
-- Energy Use: {st.session_state['current_predictions']['Energy_Use_MJ_per_kg']:.2f} MJ/kg
-- CO2 Emissions: {st.session_state['current_predictions']['Emission_kgCO2_per_kg']:.2f} kg CO2/kg
-- Water Use: {st.session_state['current_predictions']['Water_Use_l_per_kg']:.2f} L/kg
-
-### Circularity & Sustainability Metrics
-- Circularity Index: {st.session_state['current_predictions']['Circularity_Index']:.3f}
-- Recycled Content: {st.session_state['current_predictions']['Recycled_Content_pct']:.1f}%
-- Reuse Potential: {st.session_state['current_predictions']['Reuse_Potential_score']:.2f}
-
-### Recommendations
-- Route Optimization: {'✅ Optimized' if route_info['circularity'] > 0.6 else '⚠️ Consider higher circularity routes'}
-- Critical Mineral Status: {'⚠️ Enhanced focus needed' if selected_metal in critical_minerals else '✅ Standard approach'}
-- Sustainability Rating: {route_info['sustainability']}
-
----
-*Generated by AI-Driven LCA Tool for Metallurgy and Mining*
-"""
-                
-                st.download_button(
-                    label="📥 Download Report (TXT)",
-                    data=report_text,
-                    file_name=f"LCA_Report_{selected_metal}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
-                    mime="text/plain"
-                )
-        
-        with report_col2:
-            st.subheader("📈 Data Export")
-            if st.button("Export Analysis Data"):
-                # Prepare comprehensive data export
-                export_data = {
-                    'Metadata': {
-                        'Analysis_Date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                        'Tool_Name': 'AI-Driven LCA Tool for Metallurgy',
-                        'Industry_Sector': selected_sector,
-                        'Metal_Type': selected_metal,
-                        'Process_Type': selected_process,
-                        'End_of_Life': selected_eol,
-                        'Circular_Route': selected_route,
-                        'Route_Circularity': route_info['circularity'],
-                        'Route_Sustainability': route_info['sustainability']
-                    },
-                    'Input_Parameters': {
-                        'Transport_Distance_km': transport_km,
-                        'Cost_per_kg': cost_per_kg,
-                        'Production_Volume_kg': production_volume,
-                        'Recovery_Rate_pct': recovery_rate
-                    },
-                    'Environmental_Results': {
-                        'Energy_Use_MJ_per_kg': st.session_state['current_predictions']['Energy_Use_MJ_per_kg'],
-                        'CO2_Emission_kg_per_kg': st.session_state['current_predictions']['Emission_kgCO2_per_kg'],
-                        'Water_Use_L_per_kg': st.session_state['current_predictions']['Water_Use_l_per_kg']
-                    },
-                    'Circularity_Results': {
-                        'Circularity_Index': st.session_state['current_predictions']['Circularity_Index'],
-                        'Recycled_Content_pct': st.session_state['current_predictions']['Recycled_Content_pct'],
-                        'Reuse_Potential_score': st.session_state['current_predictions']['Reuse_Potential_score']
-                    }
-                }
-                
-                # Convert to JSON for download
-                json_str = json.dumps(export_data, indent=2)
-                
-                st.download_button(
-                    label="📊 Download JSON Data",
-                    data=json_str,
-                    file_name=f"LCA_Data_{selected_metal}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                    mime="application/json"
-                )
-        
-        with report_col3:
-            st.subheader("📈 Analysis Summary")
-            st.success("✅ **Analysis Complete**")
-            
-            analysis_summary = [
-                "🔬 Environmental Impact Analysis",
-                "♻️ Circularity Assessment", 
-                "🌱 Sustainability Evaluation",
-                "⚡ Performance Optimization",
-                "📊 Data-Driven Insights",
-                "🎯 Actionable Recommendations"
-            ]
-            
-            for item in analysis_summary:
-                st.markdown(f"- {item}")
-                
-            st.info("� **Comprehensive LCA analysis completed successfully**")
-
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,135 +1,221 @@
 import plotly.graph_objects as go
-import plotly.express as px
 import pandas as pd
 import numpy as np
 import streamlit as st
+import functools
+import operator
+import json
+import plotly.io as pio
+
+# Serialize figure payloads for st.plotly_chart with orjson when it is installed
+try:
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = 'orjson'
+except ImportError:
+    pass
+
+# Closed radar axes (first metric repeated to close the polygon)
+_RADAR_THETA = ('Circularity Index', 'Recycled Content (%)', 'Reuse Potential', 'Circularity Index')
+_DASHBOARD_RADAR_THETA = ('Circularity Index', 'Recycled Content', 'Reuse Potential', 'Circularity Index')
+
+# Shared layout for the placeholder figure shown when a chart fails to build
+_ERROR_LAYOUT = {
+    "paper_bgcolor": "#F8F9FA",
+    "xaxis": {"visible": False},
+    "yaxis": {"visible": False}
+}
+
+def _error_figure(title, message, height=400):
+    """Placeholder figure carrying an error message, built from one layout dict"""
+    return go.Figure({
+        "data": [],
+        "layout": {
+            **_ERROR_LAYOUT,
+            "title": {"text": title},
+            "height": height,
+            "annotations": [{
+                "text": message,
+                "xref": "paper", "yref": "paper", "x": 0.5, "y": 0.5,
+                "font": {"size": 14, "color": "#E74C3C"},
+                "showarrow": False
+            }]
+        }
+    })
+
+# Prediction keys the figure builders read; cached builders are keyed on these values
+_PREDICTION_KEYS = (
+    'Energy_Use_MJ_per_kg', 'Emission_kgCO2_per_kg', 'Water_Use_l_per_kg',
+    'Circularity_Index', 'Recycled_Content_pct', 'Reuse_Potential_score'
+)
+
+# Per-chart fallbacks for missing predictions, merged under the caller's values
+_SANKEY_DEFAULTS = {
+    'Energy_Use_MJ_per_kg': 100, 'Emission_kgCO2_per_kg': 10, 'Water_Use_l_per_kg': 50,
+    'Circularity_Index': 0.3, 'Recycled_Content_pct': 30, 'Reuse_Potential_score': 0.5
+}
+_ZERO_DEFAULTS = dict.fromkeys(_PREDICTION_KEYS, 0)
+# Missing environmental values score as the worst case in the sustainability gauge
+_SCORE_DEFAULTS = dict(_ZERO_DEFAULTS, Energy_Use_MJ_per_kg=200, Emission_kgCO2_per_kg=20, Water_Use_l_per_kg=100)
+
+# Positional readers over the merged predictions
+_read_predictions = operator.itemgetter(*_PREDICTION_KEYS)
+_read_environmental = operator.itemgetter(*_PREDICTION_KEYS[:3])
+
+def _prediction_items(predictions):
+    """Hashable (key, value) pairs for the predictions present, as plain floats; None if unusable"""
+    if not hasattr(predictions, 'get'):
+        return None
+    try:
+        items = ((key, predictions.get(key)) for key in _PREDICTION_KEYS)
+        return tuple((key, float(value)) for key, value in items if value is not None)
+    except (TypeError, ValueError):
+        return None
+
+# Sankey nodes for the material flow: raw → process → end-of-life
+_SANKEY_LABELS = (
+    "Virgin Raw Materials",     # 0
+    "Recycled Materials",       # 1 
+    "Energy Inputs",            # 2
+    "Water Inputs",             # 3
+    "Transportation",           # 4
+    "Production Process",       # 5
+    "Metal Product",            # 6
+    "CO₂ Emissions",            # 7
+    "Wastewater",              # 8
+    "Solid Waste",             # 9
+    "Product Use",             # 10
+    "Collection",              # 11
+    "Recycling Process",       # 12
+    "Reuse Applications",      # 13
+    "Landfill",               # 14
+    "Incineration"            # 15
+)
+
+# Link endpoints, one entry per flow value
+_SANKEY_SOURCES = np.array([
+    0, 1, 2, 3, 4,           # Inputs to production
+    5, 5, 5, 5,              # Production outputs
+    6, 10, 10, 10,           # Product lifecycle
+    11, 11, 11               # End-of-life flows
+], dtype=np.int32)
+
+_SANKEY_TARGETS = np.array([
+    5, 5, 5, 5, 5,           # To production process
+    6, 7, 8, 9,              # From production
+    10, 11, 12, 13,          # Product use and collection
+    12, 14, 15               # End-of-life destinations
+], dtype=np.int32)
+
+# Enhanced color scheme
+_SANKEY_COLORS = (
+    "#FF6B6B",  # Virgin Raw Materials - Red
+    "#2ECC71",  # Recycled Materials - Green
+    "#F39C12",  # Energy - Orange
+    "#3498DB",  # Water - Blue
+    "#9B59B6",  # Transportation - Purple
+    "#1ABC9C",  # Production - Teal
+    "#F1C40F",  # Product - Yellow
+    "#E74C3C",  # Emissions - Dark Red
+    "#5DADE2",  # Wastewater - Light Blue
+    "#D35400",  # Solid Waste - Brown
+    "#27AE60",  # Product Use - Dark Green
+    "#8E44AD",  # Collection - Dark Purple
+    "#16A085",  # Recycling - Dark Teal
+    "#2980B9",  # Reuse - Dark Blue
+    "#7F8C8D",  # Landfill - Gray
+    "#C0392B"   # Incineration - Dark Red
+)
+
+# Link colors, one per flow value
+_SANKEY_LINK_COLORS = (
+    "rgba(255, 107, 107, 0.3)",  # Virgin materials
+    "rgba(46, 204, 113, 0.3)",   # Recycled materials
+    "rgba(243, 156, 18, 0.3)",   # Energy
+    "rgba(52, 152, 219, 0.3)",   # Water
+    "rgba(155, 89, 182, 0.3)",   # Transport
+    "rgba(241, 196, 15, 0.6)",   # Production to product
+    "rgba(231, 76, 60, 0.4)",    # Emissions
+    "rgba(93, 173, 226, 0.3)",   # Wastewater
+    "rgba(211, 84, 0, 0.3)",     # Solid waste
+    "rgba(39, 174, 96, 0.5)",    # Product use
+    "rgba(142, 68, 173, 0.4)",   # Collection
+    "rgba(41, 128, 185, 0.4)",   # Reuse
+    "rgba(127, 140, 141, 0.3)",  # To waste
+    "rgba(22, 160, 133, 0.5)",   # Recycling
+    "rgba(127, 140, 141, 0.4)",  # Landfill
+    "rgba(192, 57, 43, 0.4)"     # Incineration
+)
+
+# Fixed node positions for the layout above
+_SANKEY_X = np.array([0.1, 0.1, 0.05, 0.05, 0.05, 0.3, 0.5, 0.4, 0.4, 0.4, 0.7, 0.85, 0.95, 0.95, 0.95, 0.95])
+_SANKEY_Y = np.array([0.1, 0.3, 0.5, 0.7, 0.9, 0.5, 0.5, 0.2, 0.4, 0.6, 0.5, 0.5, 0.2, 0.4, 0.6, 0.8])
 
 def create_sankey_diagram(predictions, process_type="Secondary Production"):
     """Create a comprehensive Sankey diagram showing material flow: raw → process → end-of-life"""
+    prediction_items = _prediction_items(predictions)
+    if prediction_items is None:
+        return _error_figure("Material Flow Analysis", "⚠️ Sankey diagram temporarily unavailable<br>Error: invalid predictions")
+    return go.Figure(_build_sankey_diagram(prediction_items, process_type))
+
+@st.cache_data(ttl=3600, max_entries=128)
+def _build_sankey_diagram(prediction_items, process_type):
+    """Sankey figure as a plain dict, memoized on the prediction values and process type"""
+    # Inputs are validated floats, so only figure construction is guarded below
+    # Extract values from predictions
+    energy, emissions, water, circularity_index, recycled_content, reuse_potential = _read_predictions(
+        _SANKEY_DEFAULTS | dict(prediction_items)
+    )
+    reuse_potential *= 100
+    circularity_index *= 100
+    
+    # Adjust flows based on process type
+    virgin_materials = 100 - recycled_content if process_type != "Primary Production" else 100
+    recycling_input = recycled_content if process_type != "Primary Production" else 0
+    
+    # Calculate flow values
+    waste_factor = 15 + (emissions * 2)  # Higher emissions = more waste
+    collection_rate = min(90, circularity_index + 20)  # Better circularity = better collection
+    
+    waste_rest = 100 - collection_rate - reuse_potential
+    uncollected = 100 - collection_rate
+    
+    # One contiguous buffer for the serializer instead of 16 boxed floats
+    values = np.array([
+        virgin_materials,         # Virgin materials to production
+        recycling_input,          # Recycled materials to production  
+        energy * 0.5,            # Energy to production (scaled)
+        water / 3.0,             # Water to production (scaled)
+        10.0,                    # Transport to production
+        100.0,                   # Production to product
+        emissions * 8.0,         # Production to emissions
+        water * 0.25,            # Production to wastewater
+        waste_factor,            # Production to solid waste
+        100.0,                   # Product to use phase
+        collection_rate,         # Use to collection
+        reuse_potential,         # Use to reuse
+        waste_rest,              # Use to waste
+        recycled_content,        # Collection to recycling
+        uncollected * 0.6,       # Collection to landfill
+        uncollected * 0.4        # Collection to incineration
+    ], dtype=np.float32)
+    
     try:
-        # Extract values from predictions
-        energy = predictions.get('Energy_Use_MJ_per_kg', 100)
-        emissions = predictions.get('Emission_kgCO2_per_kg', 10)
-        water = predictions.get('Water_Use_l_per_kg', 50)
-        recycled_content = predictions.get('Recycled_Content_pct', 30)
-        reuse_potential = predictions.get('Reuse_Potential_score', 0.5) * 100
-        circularity_index = predictions.get('Circularity_Index', 0.3) * 100
-        
-        # Adjust flows based on process type
-        virgin_materials = 100 - recycled_content if process_type != "Primary Production" else 100
-        recycling_input = recycled_content if process_type != "Primary Production" else 0
-        
-        # Define comprehensive nodes for material flow
-        labels = [
-            "Virgin Raw Materials",     # 0
-            "Recycled Materials",       # 1 
-            "Energy Inputs",            # 2
-            "Water Inputs",             # 3
-            "Transportation",           # 4
-            "Production Process",       # 5
-            "Metal Product",            # 6
-            "CO₂ Emissions",            # 7
-            "Wastewater",              # 8
-            "Solid Waste",             # 9
-            "Product Use",             # 10
-            "Collection",              # 11
-            "Recycling Process",       # 12
-            "Reuse Applications",      # 13
-            "Landfill",               # 14
-            "Incineration"            # 15
-        ]
-        
-        # Define comprehensive flows
-        sources = [
-            0, 1, 2, 3, 4,           # Inputs to production
-            5, 5, 5, 5,              # Production outputs
-            6, 10, 10, 10,           # Product lifecycle
-            11, 11, 11               # End-of-life flows
-        ]
-        
-        targets = [
-            5, 5, 5, 5, 5,           # To production process
-            6, 7, 8, 9,              # From production
-            10, 11, 12, 13,          # Product use and collection
-            12, 14, 15               # End-of-life destinations
-        ]
-        
-        # Calculate flow values
-        waste_factor = 15 + (emissions * 2)  # Higher emissions = more waste
-        collection_rate = min(90, circularity_index + 20)  # Better circularity = better collection
-        
-        values = [
-            virgin_materials,         # Virgin materials to production
-            recycling_input,          # Recycled materials to production  
-            energy / 2,              # Energy to production (scaled)
-            water / 3,               # Water to production (scaled)
-            10,                      # Transport to production
-            100,                     # Production to product
-            emissions * 8,           # Production to emissions
-            water / 4,               # Production to wastewater
-            waste_factor,            # Production to solid waste
-            100,                     # Product to use phase
-            collection_rate,         # Use to collection
-            reuse_potential,         # Use to reuse
-            100 - collection_rate - reuse_potential,  # Use to waste
-            recycled_content,        # Collection to recycling
-            (100 - collection_rate) * 0.6,  # Collection to landfill
-            (100 - collection_rate) * 0.4   # Collection to incineration
-        ]
-        
-        # Enhanced color scheme
-        colors = [
-            "#FF6B6B",  # Virgin Raw Materials - Red
-            "#2ECC71",  # Recycled Materials - Green
-            "#F39C12",  # Energy - Orange
-            "#3498DB",  # Water - Blue
-            "#9B59B6",  # Transportation - Purple
-            "#1ABC9C",  # Production - Teal
-            "#F1C40F",  # Product - Yellow
-            "#E74C3C",  # Emissions - Dark Red
-            "#5DADE2",  # Wastewater - Light Blue
-            "#D35400",  # Solid Waste - Brown
-            "#27AE60",  # Product Use - Dark Green
-            "#8E44AD",  # Collection - Dark Purple
-            "#16A085",  # Recycling - Dark Teal
-            "#2980B9",  # Reuse - Dark Blue
-            "#7F8C8D",  # Landfill - Gray
-            "#C0392B"   # Incineration - Dark Red
-        ]
-        
         # Create enhanced Sankey
         fig = go.Figure(data=[go.Sankey(
             node=dict(
                 pad=20,
                 thickness=25,
                 line=dict(color="black", width=1),
-                label=labels,
-                color=colors,
-                x=[0.1, 0.1, 0.05, 0.05, 0.05, 0.3, 0.5, 0.4, 0.4, 0.4, 0.7, 0.85, 0.95, 0.95, 0.95, 0.95],
-                y=[0.1, 0.3, 0.5, 0.7, 0.9, 0.5, 0.5, 0.2, 0.4, 0.6, 0.5, 0.5, 0.2, 0.4, 0.6, 0.8]
+                label=_SANKEY_LABELS,
+                color=_SANKEY_COLORS,
+                x=_SANKEY_X,
+                y=_SANKEY_Y
             ),
             link=dict(
-                source=sources,
-                target=targets,
+                source=_SANKEY_SOURCES,
+                target=_SANKEY_TARGETS,
                 value=values,
-                color=[
-                    "rgba(255, 107, 107, 0.3)",  # Virgin materials
-                    "rgba(46, 204, 113, 0.3)",   # Recycled materials
-                    "rgba(243, 156, 18, 0.3)",   # Energy
-                    "rgba(52, 152, 219, 0.3)",   # Water
-                    "rgba(155, 89, 182, 0.3)",   # Transport
-                    "rgba(241, 196, 15, 0.6)",   # Production to product
-                    "rgba(231, 76, 60, 0.4)",    # Emissions
-                    "rgba(93, 173, 226, 0.3)",   # Wastewater
-                    "rgba(211, 84, 0, 0.3)",     # Solid waste
-                    "rgba(39, 174, 96, 0.5)",    # Product use
-                    "rgba(142, 68, 173, 0.4)",   # Collection
-                    "rgba(41, 128, 185, 0.4)",   # Reuse
-                    "rgba(127, 140, 141, 0.3)",  # To waste
-                    "rgba(22, 160, 133, 0.5)",   # Recycling
-                    "rgba(127, 140, 141, 0.4)",  # Landfill
-                    "rgba(192, 57, 43, 0.4)"     # Incineration
-                ]
+                color=_SANKEY_LINK_COLORS
             )
         )])
         
@@ -152,26 +238,13 @@ def create_sankey_diagram(predictions, process_type="Secondary Production"):
             plot_bgcolor="white"
         )
         
-        return fig
+        return fig.to_dict()
     
     except Exception as e:
-        # Enhanced fallback chart
-        fig = go.Figure()
-        fig.add_annotation(
-            text=f"⚠️ Sankey diagram temporarily unavailable<br>Error: {str(e)}", 
-            xref="paper", yref="paper", x=0.5, y=0.5,
-            font=dict(size=14, color="#E74C3C"),
-            showarrow=False
-        )
-        fig.update_layout(
-            title="Material Flow Analysis", 
-            height=400,
-            paper_bgcolor="#F8F9FA"
-        )
-        return fig
+        return _error_figure("Material Flow Analysis", f"⚠️ Sankey diagram temporarily unavailable<br>Error: {str(e)}").to_dict()
 
-def create_energy_comparison(comparison_df):
-    """Create energy comparison bar chart"""
+def _make_comparison_bar(comparison_df, y_col, title, colorscale, y_label, fmt, error_title, error_label):
+    """Pathway bar chart for one metric column, colored on a continuous scale with value labels"""
     try:
         if comparison_df.empty:
             fig = go.Figure()
@@ -179,85 +252,52 @@ def create_energy_comparison(comparison_df):
                               xref="paper", yref="paper", x=0.5, y=0.5)
             return fig
         
-        fig = px.bar(
-            comparison_df,
-            x='Pathway',
-            y='Energy (MJ/kg)',
-            title='Energy Consumption by Production Pathway',
-            color='Energy (MJ/kg)',
-            color_continuous_scale='Reds'
-        )
+        # Plain go.Bar skips Plotly Express's dataframe wrangling
+        values = comparison_df[y_col].to_numpy()
+        fig = go.Figure(data=[go.Bar(
+            x=comparison_df['Pathway'].to_numpy(),
+            y=values,
+            marker=dict(
+                color=values,
+                colorscale=colorscale,
+                showscale=True,
+                colorbar=dict(title=y_col)
+            ),
+            text=[fmt.format(v) for v in values],
+            textposition='outside',
+            cliponaxis=False
+        )])
         
         fig.update_layout(
+            title=title,
             xaxis_title="Production Pathway",
-            yaxis_title="Energy Use (MJ/kg)",
+            yaxis_title=y_label,
             height=400,
             showlegend=False
         )
         
-        # Add value labels on bars
-        for i, row in comparison_df.iterrows():
-            fig.add_annotation(
-                x=row['Pathway'],
-                y=row['Energy (MJ/kg)'],
-                text=f"{row['Energy (MJ/kg)']:.1f}",
-                showarrow=False,
-                yshift=10
-            )
-        
         return fig
     
     except Exception as e:
-        fig = go.Figure()
-        fig.add_annotation(text=f"Energy chart error: {str(e)}", 
-                          xref="paper", yref="paper", x=0.5, y=0.5)
-        fig.update_layout(title="Energy Comparison", height=400)
-        return fig
+        return _error_figure(error_title, f"{error_label} chart error: {str(e)}")
 
+@st.cache_data(ttl=3600, max_entries=128)
+def create_energy_comparison(comparison_df):
+    """Create energy comparison bar chart"""
+    return _make_comparison_bar(
+        comparison_df, 'Energy (MJ/kg)', 'Energy Consumption by Production Pathway', 'Reds',
+        'Energy Use (MJ/kg)', '{:.1f}', error_title="Energy Comparison", error_label="Energy"
+    )
+
+@st.cache_data(ttl=3600, max_entries=128)
 def create_emissions_comparison(comparison_df):
     """Create emissions comparison bar chart"""
-    try:
-        if comparison_df.empty:
-            fig = go.Figure()
-            fig.add_annotation(text="No comparison data available", 
-                              xref="paper", yref="paper", x=0.5, y=0.5)
-            return fig
-        
-        fig = px.bar(
-            comparison_df,
-            x='Pathway',
-            y='Emissions (kgCO2/kg)',
-            title='CO₂ Emissions by Production Pathway',
-            color='Emissions (kgCO2/kg)',
-            color_continuous_scale='Oranges'
-        )
-        
-        fig.update_layout(
-            xaxis_title="Production Pathway",
-            yaxis_title="CO₂ Emissions (kg/kg)",
-            height=400,
-            showlegend=False
-        )
-        
-        # Add value labels on bars
-        for i, row in comparison_df.iterrows():
-            fig.add_annotation(
-                x=row['Pathway'],
-                y=row['Emissions (kgCO2/kg)'],
-                text=f"{row['Emissions (kgCO2/kg)']:.2f}",
-                showarrow=False,
-                yshift=10
-            )
-        
-        return fig
-    
-    except Exception as e:
-        fig = go.Figure()
-        fig.add_annotation(text=f"Emissions chart error: {str(e)}", 
-                          xref="paper", yref="paper", x=0.5, y=0.5)
-        fig.update_layout(title="Emissions Comparison", height=400)
-        return fig
+    return _make_comparison_bar(
+        comparison_df, 'Emissions (kgCO2/kg)', 'CO₂ Emissions by Production Pathway', 'Oranges',
+        'CO₂ Emissions (kg/kg)', '{:.2f}', error_title="Emissions Comparison", error_label="Emissions"
+    )
 
+@st.cache_data(ttl=3600, max_entries=128)
 def create_circularity_comparison(comparison_df):
     """Create circularity metrics comparison radar chart"""
     try:
@@ -267,25 +307,25 @@ def create_circularity_comparison(comparison_df):
                               xref="paper", yref="paper", x=0.5, y=0.5)
             return fig
         
-        # Normalize circularity metrics to 0-100 scale for better visualization
-        metrics = ['Circularity Index', 'Recycled Content (%)', 'Reuse Potential']
-        
         fig = go.Figure()
         
         colors = ['#FF6B6B', '#4ECDC4', '#45B7D1']
         
-        for i, row in comparison_df.iterrows():
-            values = [
-                row['Circularity Index'] * 100,  # Convert to percentage
-                row['Recycled Content (%)'],
-                row['Reuse Potential'] * 100     # Convert to percentage
-            ]
-            
+        # Normalize circularity metrics to 0-100 scale for better visualization;
+        # one (pathways x 4) buffer holds every closed polygon
+        pathways = comparison_df['Pathway'].to_numpy()
+        radii = np.empty((len(pathways), len(_RADAR_THETA)), dtype=np.float32)
+        radii[:, 0] = comparison_df['Circularity Index'].to_numpy() * 100  # Convert to percentage
+        radii[:, 1] = comparison_df['Recycled Content (%)'].to_numpy()
+        radii[:, 2] = comparison_df['Reuse Potential'].to_numpy() * 100    # Convert to percentage
+        radii[:, -1] = radii[:, 0]  # Close the polygon
+        
+        for i, (name, r) in enumerate(zip(pathways, radii)):
             fig.add_trace(go.Scatterpolar(
-                r=values + [values[0]],  # Close the polygon
-                theta=metrics + [metrics[0]],
+                r=r,
+                theta=_RADAR_THETA,
                 fill='toself',
-                name=row['Pathway'],
+                name=name,
                 line_color=colors[i % len(colors)]
             ))
         
@@ -303,85 +343,46 @@ def create_circularity_comparison(comparison_df):
         return fig
     
     except Exception as e:
-        fig = go.Figure()
-        fig.add_annotation(text=f"Circularity chart error: {str(e)}", 
-                          xref="paper", yref="paper", x=0.5, y=0.5)
-        fig.update_layout(title="Circularity Comparison", height=400)
-        return fig
+        return _error_figure("Circularity Comparison", f"Circularity chart error: {str(e)}")
 
 def create_water_usage_chart(comparison_df):
     """Create water usage comparison chart"""
-    try:
-        if comparison_df.empty:
-            fig = go.Figure()
-            fig.add_annotation(text="No comparison data available", 
-                              xref="paper", yref="paper", x=0.5, y=0.5)
-            return fig
-        
-        fig = px.bar(
-            comparison_df,
-            x='Pathway',
-            y='Water (L/kg)',
-            title='Water Usage by Production Pathway',
-            color='Water (L/kg)',
-            color_continuous_scale='Blues'
-        )
-        
-        fig.update_layout(
-            xaxis_title="Production Pathway",
-            yaxis_title="Water Use (L/kg)",
-            height=400,
-            showlegend=False
-        )
-        
-        # Add value labels on bars
-        for i, row in comparison_df.iterrows():
-            fig.add_annotation(
-                x=row['Pathway'],
-                y=row['Water (L/kg)'],
-                text=f"{row['Water (L/kg)']:.1f}",
-                showarrow=False,
-                yshift=10
-            )
-        
-        return fig
-    
-    except Exception as e:
-        fig = go.Figure()
-        fig.add_annotation(text=f"Water chart error: {str(e)}", 
-                          xref="paper", yref="paper", x=0.5, y=0.5)
-        fig.update_layout(title="Water Usage Comparison", height=400)
-        return fig
+    return _make_comparison_bar(
+        comparison_df, 'Water (L/kg)', 'Water Usage by Production Pathway', 'Blues',
+        'Water Use (L/kg)', '{:.1f}', error_title="Water Usage Comparison", error_label="Water"
+    )
+
+# Summary chart bars and the assumed maxima used to normalize them
+_SUMMARY_LABELS = ('Energy Use', 'CO₂ Emissions', 'Water Use')
+_SUMMARY_COLORS = ('#FF6B6B', '#FFA500', '#4169E1')
+_SUMMARY_MAXES = np.array([200.0, 20.0, 100.0], dtype=np.float32)
 
 def create_environmental_summary_chart(predictions):
     """Create a summary chart of all environmental indicators"""
+    prediction_items = _prediction_items(predictions)
+    if prediction_items is None:
+        return _error_figure("Environmental Summary", "Summary chart error: invalid predictions")
+    return go.Figure(_build_environmental_summary_chart(prediction_items))
+
+@st.cache_data(ttl=3600, max_entries=128)
+def _build_environmental_summary_chart(prediction_items):
+    """Environmental summary figure as a plain dict, memoized on the prediction values"""
+    # Inputs are validated floats, so only figure construction is guarded below
+    # Extract environmental values
+    energy, emissions, water = _read_environmental(_ZERO_DEFAULTS | dict(prediction_items))
+    
+    # Normalize values for comparison (scale to 0-100) in one array operation
+    raw = np.array([energy, emissions, water], dtype=np.float32)
+    normalized_values = raw / _SUMMARY_MAXES * 100.0
+    text = (f'{energy:.1f} MJ/kg', f'{emissions:.2f} kgCO₂/kg', f'{water:.1f} L/kg')
+    
     try:
-        # Extract environmental values
-        energy = predictions.get('Energy_Use_MJ_per_kg', 0)
-        emissions = predictions.get('Emission_kgCO2_per_kg', 0)
-        water = predictions.get('Water_Use_l_per_kg', 0)
-        
-        # Normalize values for comparison (scale to 0-100)
-        max_energy = 200  # Assumed max for normalization
-        max_emissions = 20
-        max_water = 100
-        
-        normalized_values = [
-            (energy / max_energy) * 100,
-            (emissions / max_emissions) * 100,
-            (water / max_water) * 100
-        ]
-        
-        labels = ['Energy Use', 'CO₂ Emissions', 'Water Use']
-        
         fig = go.Figure(data=[
             go.Bar(
-                x=labels,
+                x=_SUMMARY_LABELS,
                 y=normalized_values,
-                marker_color=['#FF6B6B', '#FFA500', '#4169E1'],
-                text=[f'{energy:.1f} MJ/kg', 
-                      f'{emissions:.2f} kgCO₂/kg', 
-                      f'{water:.1f} L/kg'],
+                marker_color=_SUMMARY_COLORS,
+                text=text,
                 textposition='auto'
             )
         ])
@@ -393,98 +394,89 @@ def create_environmental_summary_chart(predictions):
             height=400
         )
         
-        return fig
+        return fig.to_dict()
     
     except Exception as e:
-        fig = go.Figure()
-        fig.add_annotation(text=f"Summary chart error: {str(e)}", 
-                          xref="paper", yref="paper", x=0.5, y=0.5)
-        fig.update_layout(title="Environmental Summary", height=400)
-        return fig
+        return _error_figure("Environmental Summary", f"Summary chart error: {str(e)}").to_dict()
+
+@st.cache_data
+def _default_metals_df():
+    """Sample per-metal impacts shown when no comparison data is provided"""
+    metals = ['Aluminum', 'Steel', 'Copper', 'Zinc', 'Lead', 'Nickel']
+    return pd.DataFrame({
+        'Metal': metals,
+        'Energy_Use_MJ_per_kg': [150, 120, 80, 65, 45, 180],
+        'Emission_kgCO2_per_kg': [12, 8, 5, 4, 3, 15],
+        'Water_Use_l_per_kg': [60, 45, 35, 25, 20, 70]
+    })
+
+@st.cache_data
+def _default_scatter_df():
+    """Seeded sample points shown when no circularity data is provided"""
+    rng = np.random.default_rng(42)
+    n_points = 50
+    
+    # Create realistic relationships
+    recycled_content = rng.normal(40, 20, n_points)
+    recycled_content = np.clip(recycled_content, 0, 100)
+    
+    # Circularity generally increases with recycled content but with variation
+    circularity_base = (recycled_content / 100) * 0.7 + 0.1
+    circularity_noise = rng.normal(0, 0.1, n_points)
+    circularity_index = np.clip(circularity_base + circularity_noise, 0, 1)
+    
+    # Add categorical data as dictionary-encoded columns
+    metals = pd.Categorical.from_codes(
+        rng.integers(0, 5, n_points), ['Aluminum', 'Steel', 'Copper', 'Zinc', 'Lead']
+    )
+    processes = pd.Categorical.from_codes(
+        rng.integers(0, 3, n_points), ['Primary', 'Secondary', 'Hybrid']
+    )
+    
+    return pd.DataFrame({
+        'Recycled_Content_pct': recycled_content,
+        'Circularity_Index': circularity_index,
+        'Metal': metals,
+        'Process_Type': processes,
+        'Reuse_Potential': rng.uniform(0, 1, n_points)
+    })
 
 def create_metal_comparison_chart(comparison_data=None):
     """Create interactive bar chart comparing Energy, Emissions, Water across different metals"""
     try:
         # Sample data if none provided
         if comparison_data is None:
-            metals = ['Aluminum', 'Steel', 'Copper', 'Zinc', 'Lead', 'Nickel']
-            comparison_data = pd.DataFrame({
-                'Metal': metals,
-                'Energy_Use_MJ_per_kg': [150, 120, 80, 65, 45, 180],
-                'Emission_kgCO2_per_kg': [12, 8, 5, 4, 3, 15],
-                'Water_Use_l_per_kg': [60, 45, 35, 25, 20, 70]
-            })
-        
-        # Create subplot with secondary y-axis
-        fig = go.Figure()
+            comparison_data = _default_metals_df()
         
-        # Add Energy bars
-        fig.add_trace(go.Bar(
-            name='Energy Use (MJ/kg)',
-            x=comparison_data['Metal'],
-            y=comparison_data['Energy_Use_MJ_per_kg'],
-            yaxis='y',
-            marker_color='#FF6B6B',
-            text=comparison_data['Energy_Use_MJ_per_kg'],
-            textposition='auto',
-            hovertemplate='<b>%{x}</b><br>Energy: %{y:.1f} MJ/kg<extra></extra>'
-        ))
-        
-        # Add Emissions bars  
-        fig.add_trace(go.Bar(
-            name='CO₂ Emissions (kg/kg)',
-            x=comparison_data['Metal'],
-            y=comparison_data['Emission_kgCO2_per_kg'],
-            yaxis='y2',
-            marker_color='#FFA500',
-            text=comparison_data['Emission_kgCO2_per_kg'],
-            textposition='auto',
-            hovertemplate='<b>%{x}</b><br>Emissions: %{y:.1f} kgCO₂/kg<extra></extra>'
-        ))
+        fig = go.Figure()
         
-        # Add Water bars
-        fig.add_trace(go.Bar(
-            name='Water Use (L/kg)',
-            x=comparison_data['Metal'], 
-            y=comparison_data['Water_Use_l_per_kg'],
-            yaxis='y3',
-            marker_color='#4169E1',
-            text=comparison_data['Water_Use_l_per_kg'],
-            textposition='auto',
-            hovertemplate='<b>%{x}</b><br>Water: %{y:.1f} L/kg<extra></extra>'
-        ))
+        # Each metric is scaled to its own maximum so all three share one 0-100 axis;
+        # the raw values stay on the bars as text
+        for name, column, color in (
+            ('Energy Use (MJ/kg)', 'Energy_Use_MJ_per_kg', '#FF6B6B'),
+            ('CO₂ Emissions (kg/kg)', 'Emission_kgCO2_per_kg', '#FFA500'),
+            ('Water Use (L/kg)', 'Water_Use_l_per_kg', '#4169E1')
+        ):
+            raw = comparison_data[column].to_numpy(dtype=np.float64)
+            fig.add_trace(go.Bar(
+                name=name,
+                x=comparison_data['Metal'],
+                y=raw / raw.max() * 100,
+                marker_color=color,
+                text=[f'{v:.1f}' for v in raw],
+                textposition='auto',
+                hoverinfo='name+y'
+            ))
         
-        # Update layout with multiple y-axes
+        # Single normalized y-axis shared by all metrics
         fig.update_layout(
             title=dict(
                 text="Environmental Impact Comparison Across Metals",
                 x=0.5,
                 font=dict(size=16, color="#2C3E50")
             ),
-            xaxis=dict(title="Metal Type", titlefont=dict(size=14)),
-            yaxis=dict(
-                title="Energy Use (MJ/kg)", 
-                titlefont=dict(color="#FF6B6B", size=14),
-                tickfont=dict(color="#FF6B6B"),
-                side="left"
-            ),
-            yaxis2=dict(
-                title="CO₂ Emissions (kg/kg)",
-                titlefont=dict(color="#FFA500", size=14),
-                tickfont=dict(color="#FFA500"),
-                anchor="x",
-                overlaying="y",
-                side="right"
-            ),
-            yaxis3=dict(
-                title="Water Use (L/kg)",
-                titlefont=dict(color="#4169E1", size=14), 
-                tickfont=dict(color="#4169E1"),
-                anchor="free",
-                overlaying="y",
-                side="right",
-                position=0.95
-            ),
+            xaxis=dict(title=dict(text="Metal Type", font=dict(size=14))),
+            yaxis=dict(title="Normalized Impact (0-100)", range=[0, 105]),
             barmode='group',
             height=450,
             margin=dict(t=80, l=60, r=80, b=60),
@@ -494,51 +486,23 @@ def create_metal_comparison_chart(comparison_data=None):
                 y=1.02,
                 xanchor="right", 
                 x=1
-            ),
-            hovermode='x unified'
+            )
         )
         
         return fig
         
     except Exception as e:
-        fig = go.Figure()
-        fig.add_annotation(
-            text=f"⚠️ Metal comparison chart unavailable<br>Error: {str(e)}", 
-            xref="paper", yref="paper", x=0.5, y=0.5,
-            font=dict(size=14, color="#E74C3C"),
-            showarrow=False
-        )
-        fig.update_layout(title="Metal Environmental Comparison", height=400)
-        return fig
+        return _error_figure("Metal Environmental Comparison", f"⚠️ Metal comparison chart unavailable<br>Error: {str(e)}")
 
 def create_circularity_scatter_plot(data_points=None):
-    """Create interactive scatter plot of Circularity Index vs Recycled Content"""
+    """Create interactive scatter plot of Circularity Index vs Recycled Content (rendered with WebGL)"""
     try:
         # Generate sample data if none provided
         if data_points is None:
-            np.random.seed(42)
-            n_points = 50
-            
-            # Create realistic relationships
-            recycled_content = np.random.normal(40, 20, n_points)
-            recycled_content = np.clip(recycled_content, 0, 100)
-            
-            # Circularity generally increases with recycled content but with variation
-            circularity_base = (recycled_content / 100) * 0.7 + 0.1
-            circularity_noise = np.random.normal(0, 0.1, n_points)
-            circularity_index = np.clip(circularity_base + circularity_noise, 0, 1)
-            
-            # Add categorical data
-            metals = np.random.choice(['Aluminum', 'Steel', 'Copper', 'Zinc', 'Lead'], n_points)
-            processes = np.random.choice(['Primary', 'Secondary', 'Hybrid'], n_points)
-            
-            data_points = pd.DataFrame({
-                'Recycled_Content_pct': recycled_content,
-                'Circularity_Index': circularity_index,
-                'Metal': metals,
-                'Process_Type': processes,
-                'Reuse_Potential': np.random.uniform(0, 1, n_points)
-            })
+            data_points = _default_scatter_df()
+        
+        # Plotly Express is only needed here, so it is imported on first use
+        import plotly.express as px
         
         # Create scatter plot with color coding
         fig = px.scatter(
@@ -555,24 +519,27 @@ def create_circularity_scatter_plot(data_points=None):
                 'Reuse_Potential': 'Reuse Potential'
             },
             hover_data=['Process_Type'],
-            size_max=20
+            size_max=20,
+            render_mode='webgl'
         )
         
-        # Add trend line
-        from sklearn.linear_model import LinearRegression
-        X = np.array(data_points['Recycled_Content_pct']).reshape(-1, 1)
-        y = np.array(data_points['Circularity_Index'])
+        # Add trend line (closed-form single-variable least squares)
+        x = data_points['Recycled_Content_pct'].to_numpy(dtype=float)
+        y = data_points['Circularity_Index'].to_numpy(dtype=float)
         
-        reg = LinearRegression().fit(X, y)
-        trend_x = np.linspace(data_points['Recycled_Content_pct'].min(), 
-                             data_points['Recycled_Content_pct'].max(), 100)
-        trend_y = reg.predict(trend_x.reshape(-1, 1))
+        slope, intercept = np.polyfit(x, y, 1)
+        trend_x = np.linspace(x.min(), x.max(), 100)
+        trend_y = slope * trend_x + intercept
         
-        fig.add_trace(go.Scatter(
+        ss_res = ((y - (slope * x + intercept)) ** 2).sum()
+        ss_tot = ((y - y.mean()) ** 2).sum()
+        r2 = 1 - ss_res / ss_tot
+        
+        fig.add_trace(go.Scattergl(
             x=trend_x,
             y=trend_y,
             mode='lines',
-            name=f'Trend (R² = {reg.score(X, y):.3f})',
+            name=f'Trend (R² = {r2:.3f})',
             line=dict(color='red', width=2, dash='dash'),
             hovertemplate='Trend Line<extra></extra>'
         ))
@@ -628,66 +595,92 @@ def create_circularity_scatter_plot(data_points=None):
         return fig
         
     except Exception as e:
-        fig = go.Figure()
-        fig.add_annotation(
-            text=f"⚠️ Circularity scatter plot unavailable<br>Error: {str(e)}", 
-            xref="paper", yref="paper", x=0.5, y=0.5,
-            font=dict(size=14, color="#E74C3C"),
-            showarrow=False
-        )
-        fig.update_layout(title="Circularity vs Recycled Content Analysis", height=400)
-        return fig
+        return _error_figure("Circularity vs Recycled Content Analysis", f"⚠️ Circularity scatter plot unavailable<br>Error: {str(e)}")
+
+def _sustainability_score(energy, emissions, water, circularity):
+    """Overall sustainability score (0-100) for a single prediction"""
+    return (
+        (1 - min(energy / 200, 1)) * 25 +
+        (1 - min(emissions / 20, 1)) * 25 +
+        (1 - min(water / 100, 1)) * 25 +
+        (circularity * 25)
+    )
+
+@functools.lru_cache(maxsize=1)
+def _dashboard_skeleton_json():
+    """2x2 dashboard grid from make_subplots, validated once and kept as JSON"""
+    from plotly.subplots import make_subplots
+    
+    grid = make_subplots(
+        rows=2, cols=2,
+        subplot_titles=(
+            "Environmental Impact Summary",
+            "Circularity Metrics",
+            "Process Efficiency",
+            "Sustainability Score"
+        ),
+        specs=[[{"type": "bar"}, {"type": "scatterpolar"}],
+               [{"type": "scatter"}, {"type": "indicator"}]]
+    )
+    layout = grid.layout.to_plotly_json()
+    # The template is re-applied to each new figure, so it is not worth caching
+    layout.pop('template', None)
+    indicator_cell = grid.get_subplot(2, 2)
+    return json.dumps({
+        'layout': layout,
+        'indicator_domain': {'x': list(indicator_cell.x), 'y': list(indicator_cell.y)}
+    })
 
 def create_comprehensive_dashboard(predictions, comparison_df=None):
     """Create a comprehensive dashboard with multiple visualizations"""
+    prediction_items = _prediction_items(predictions)
+    if prediction_items is None:
+        return _error_figure("LCA Performance Dashboard", "⚠️ Dashboard unavailable<br>Error: invalid predictions", height=600)
+    return go.Figure(_build_comprehensive_dashboard(prediction_items, comparison_df))
+
+@st.cache_data(ttl=3600, max_entries=128)
+def _build_comprehensive_dashboard(prediction_items, comparison_df):
+    """Dashboard figure as a plain dict, memoized on the prediction values and comparison data"""
+    predictions = dict(prediction_items)
+    energy, emissions, water, circularity, recycled, reuse = _read_predictions(_ZERO_DEFAULTS | predictions)
     try:
-        from plotly.subplots import make_subplots
-        
-        # Create subplot layout
-        fig = make_subplots(
-            rows=2, cols=2,
-            subplot_titles=(
-                "Environmental Impact Summary",
-                "Circularity Metrics",
-                "Process Efficiency",
-                "Sustainability Score"
-            ),
-            specs=[[{"type": "bar"}, {"type": "scatterpolar"}],
-                   [{"type": "scatter"}, {"type": "indicator"}]]
-        )
+        # Create subplot layout from the cached grid; traces name their axes explicitly
+        skeleton = json.loads(_dashboard_skeleton_json())
+        fig = go.Figure(layout=skeleton['layout'])
         
         # Environmental Impact Bar Chart
         env_metrics = ['Energy', 'Emissions', 'Water']
         env_values = [
-            predictions.get('Energy_Use_MJ_per_kg', 0),
-            predictions.get('Emission_kgCO2_per_kg', 0) * 10,  # Scale for visibility
-            predictions.get('Water_Use_l_per_kg', 0)
+            energy,
+            emissions * 10,  # Scale for visibility
+            water
         ]
         
         fig.add_trace(
             go.Bar(x=env_metrics, y=env_values, 
                    marker_color=['#FF6B6B', '#FFA500', '#4169E1'],
-                   name="Environmental"),
-            row=1, col=1
+                   name="Environmental",
+                   xaxis='x', yaxis='y')
         )
         
         # Circularity Radar Chart
-        circ_metrics = ['Circularity Index', 'Recycled Content', 'Reuse Potential']
-        circ_values = [
-            predictions.get('Circularity_Index', 0) * 100,
-            predictions.get('Recycled_Content_pct', 0),
-            predictions.get('Reuse_Potential_score', 0) * 100
+        circ_values = np.empty(len(_DASHBOARD_RADAR_THETA), dtype=np.float32)
+        circ_values[:-1] = [
+            circularity * 100,
+            recycled,
+            reuse * 100
         ]
+        circ_values[-1] = circ_values[0]  # Close the polygon
         
         fig.add_trace(
             go.Scatterpolar(
-                r=circ_values + [circ_values[0]],
-                theta=circ_metrics + [circ_metrics[0]],
+                r=circ_values,
+                theta=_DASHBOARD_RADAR_THETA,
                 fill='toself',
                 name="Circularity",
-                marker_color='#2ECC71'
-            ),
-            row=1, col=2
+                marker_color='#2ECC71',
+                subplot='polar'
+            )
         )
         
         # Process Efficiency Scatter
@@ -700,24 +693,20 @@ def create_comprehensive_dashboard(predictions, comparison_df=None):
                     text=comparison_df['Pathway'],
                     textposition='top center',
                     marker=dict(size=12, color='#9B59B6'),
-                    name="Pathways"
-                ),
-                row=2, col=1
+                    name="Pathways",
+                    xaxis='x2', yaxis='y2'
+                )
             )
         
         # Overall Sustainability Score
-        sustainability_score = (
-            (1 - min(predictions.get('Energy_Use_MJ_per_kg', 200) / 200, 1)) * 25 +
-            (1 - min(predictions.get('Emission_kgCO2_per_kg', 20) / 20, 1)) * 25 +
-            (1 - min(predictions.get('Water_Use_l_per_kg', 100) / 100, 1)) * 25 +
-            (predictions.get('Circularity_Index', 0) * 25)
-        )
+        score_energy, score_emissions, score_water = _read_environmental(_SCORE_DEFAULTS | predictions)
+        sustainability_score = _sustainability_score(score_energy, score_emissions, score_water, circularity)
         
         fig.add_trace(
             go.Indicator(
                 mode="gauge+number+delta",
                 value=sustainability_score,
-                domain={'x': [0, 1], 'y': [0, 1]},
+                domain=skeleton['indicator_domain'],
                 title={'text': "Sustainability Score"},
                 delta={'reference': 75},
                 gauge={
@@ -734,8 +723,7 @@ def create_comprehensive_dashboard(predictions, comparison_df=None):
                         'value': 90
                     }
                 }
-            ),
-            row=2, col=2
+            )
         )
         
         # Update layout
@@ -746,15 +734,7 @@ def create_comprehensive_dashboard(predictions, comparison_df=None):
             showlegend=False
         )
         
-        return fig
+        return fig.to_dict()
         
     except Exception as e:
-        fig = go.Figure()
-        fig.add_annotation(
-            text=f"⚠️ Dashboard unavailable<br>Error: {str(e)}", 
-            xref="paper", yref="paper", x=0.5, y=0.5,
-            font=dict(size=14, color="#E74C3C"),
-            showarrow=False
-        )
-        fig.update_layout(title="LCA Performance Dashboard", height=600)
-        return fig
\ No newline at end of file
+        return _error_figure("LCA Performance Dashboard", f"⚠️ Dashboard unavailable<br>Error: {str(e)}", height=600).to_dict()
\ No newline at end of file
@@ -1,228 +1,321 @@
+from dataclasses import dataclass
+
 import numpy as np
 
+# Prediction keys, in the field order of PredictionVec
+PREDICTION_KEYS = (
+    'Energy_Use_MJ_per_kg',
+    'Emission_kgCO2_per_kg',
+    'Water_Use_l_per_kg',
+    'Circularity_Index',
+    'Recycled_Content_pct',
+    'Reuse_Potential_score'
+)
+
+@dataclass(frozen=True, slots=True)
+class PredictionVec:
+    """Predicted indicators read once from a predictions mapping; missing keys score as 0"""
+    energy: float = 0
+    emissions: float = 0
+    water: float = 0
+    circularity: float = 0
+    recycled_pct: float = 0
+    reuse: float = 0
+    
+    @classmethod
+    def from_mapping(cls, predictions):
+        return cls(*(predictions.get(key, 0) for key in PREDICTION_KEYS))
+
+def _as_vec(predictions):
+    """Attribute view of the predictions; objects with the same fields (the app's LCAResult) pass through"""
+    if hasattr(predictions, 'energy'):
+        return predictions
+    return PredictionVec.from_mapping(predictions)
+
+# Threshold ladders compiled to lookup tables: np.searchsorted maps a value to its bucket
+# and the bucket indexes the messages. "Higher is worse" metrics use side='left' so a value
+# equal to a threshold stays in the lower bucket (strict >); "lower is worse" metrics use
+# side='right' so it moves up (strict <). Messages are ordered from bucket 0 upwards.
+ENERGY_THRESHOLDS = np.array([100, 150])
+ENERGY_MESSAGES = (
+    ("✅ **Good Energy Performance**: Current energy usage is within acceptable limits",),
+    ("💡 **Moderate Energy Usage**: Look into energy-efficient equipment upgrades",),
+    ("🔥 **High Energy Usage**: Consider switching to renewable energy sources or optimizing process efficiency",
+     "⚡ Implement energy recovery systems to capture and reuse waste heat")
+)
+
+EMISSIONS_THRESHOLDS = np.array([10, 15])
+EMISSIONS_MESSAGES = (
+    ("🌿 **Low Emissions**: Excellent carbon performance, maintain current practices",),
+    ("📉 **Moderate Emissions**: Implement emission reduction strategies like process optimization",),
+    ("🌫️ **High CO₂ Emissions**: Urgent need to implement carbon capture technologies",
+     "🌱 Consider switching to low-carbon production methods or renewable energy")
+)
+
+WATER_THRESHOLDS = np.array([50, 80])
+WATER_MESSAGES = (
+    ("💙 **Efficient Water Use**: Good water management practices in place",),
+    ("💦 **Moderate Water Usage**: Optimize water efficiency in production processes",),
+    ("💧 **High Water Usage**: Implement water recycling and closed-loop systems",
+     "🔄 Consider dry processing methods where technically feasible")
+)
+
+CIRCULARITY_THRESHOLDS = np.array([0.3, 0.6])
+CIRCULARITY_MESSAGES = (
+    ("♻️ **Low Circularity**: Major improvements needed in circular design principles",
+     "🔄 Focus on design for disassembly and material recovery",
+     "🎯 Set targets for increasing material circularity by 25% within 2 years"),
+    ("📈 **Moderate Circularity**: Good foundation, aim for further improvements",
+     "🔧 Enhance product durability and repairability features"),
+    ("🏆 **Excellent Circularity**: Leading circular economy practices",)
+)
+
+RECYCLED_THRESHOLDS = np.array([20, 50])
+RECYCLED_MESSAGES = (
+    ("📦 **Low Recycled Content**: Increase use of secondary raw materials",
+     "🤝 Establish partnerships with recycling companies for material supply",
+     "🎯 Target minimum 30% recycled content in production"),
+    ("♻️ **Moderate Recycling**: Continue increasing recycled material usage",
+     "🔍 Identify opportunities to substitute virgin materials with recycled alternatives"),
+    ("🌟 **High Recycled Content**: Excellent use of secondary materials",)
+)
+
+REUSE_THRESHOLDS = np.array([0.3, 0.6])
+REUSE_MESSAGES = (
+    ("🔧 **Low Reuse Potential**: Design products for multiple life cycles",
+     "📝 Develop take-back programs for end-of-life products",
+     "🏗️ Create modular designs that enable component reuse"),
+    ("🔄 **Moderate Reuse**: Enhance product design for better reusability",
+     "📋 Implement product-as-a-service models"),
+    ("🎉 **High Reuse Potential**: Excellent design for reusability",)
+)
+
+COST_THRESHOLDS = np.array([5, 10])
+COST_MESSAGES = (
+    ("✅ **Cost Efficient**: Maintain current cost-effective practices",),
+    ("💵 **Moderate Cost**: Look for incremental cost improvements",
+     "📊 Benchmark against industry standards for cost optimization"),
+    ("💰 **High Production Cost**: Focus on cost reduction strategies",)
+)
+
+# Single-threshold technology upgrades: bucket 0 adds nothing, bucket 1 adds the upgrades
+TECH_ENERGY_THRESHOLDS = np.array([120])
+TECH_ENERGY_MESSAGES = ((), (
+    "🔋 **Energy Storage**: Implement battery systems for load balancing",
+    "🌡️ **Heat Recovery**: Install waste heat recovery systems",
+    "⚡ **Smart Grid**: Connect to smart grid for optimal energy management"
+))
+
+TECH_EMISSIONS_THRESHOLDS = np.array([12])
+TECH_EMISSIONS_MESSAGES = ((), (
+    "🌿 **Carbon Capture**: Consider CO₂ capture and utilization technologies",
+    "🔬 **Process Innovation**: Invest in low-carbon process technologies",
+    "📡 **Monitoring**: Deploy continuous emissions monitoring systems"
+))
+
+TECH_CIRCULARITY_THRESHOLDS = np.array([0.4])
+# Lower is worse here, so the upgrades sit in bucket 0
+TECH_CIRCULARITY_MESSAGES = ((
+    "🤖 **AI Sorting**: Implement AI-powered material sorting systems",
+    "📱 **Blockchain**: Use blockchain for material traceability",
+    "🔧 **IoT Sensors**: Deploy IoT for real-time process monitoring"
+), ())
+
+ENVIRONMENTAL_GENERAL_MESSAGES = (
+    "🏭 **Process Optimization**: Regular maintenance and process tuning can reduce all environmental impacts",
+    "📊 **Monitoring**: Implement real-time monitoring systems for continuous improvement"
+)
+
+CIRCULARITY_GENERAL_MESSAGES = (
+    "🏭 **Supply Chain**: Collaborate with suppliers to improve material traceability",
+    "📱 **Digital Tools**: Implement digital passports for material tracking",
+    "🎓 **Training**: Educate staff on circular economy principles and practices"
+)
+
+COST_GENERAL_MESSAGES = (
+    "🤖 **Automation**: Consider automation for labor-intensive processes",
+    "📈 **Scale**: Evaluate opportunities for economies of scale",
+    "🔗 **Supply Chain**: Optimize supply chain logistics and inventory management"
+)
+
+REGULATORY_COMPLIANCE_MESSAGES = (
+    "📋 **Environmental Regulations**: Ensure compliance with local emission standards",
+    "♻️ **Waste Regulations**: Follow proper waste management and reporting requirements",
+    "🏭 **Industrial Standards**: Maintain compliance with industry-specific regulations",
+    "📊 **Reporting**: Implement systematic environmental reporting and documentation",
+    "🔍 **Auditing**: Regular third-party environmental audits for compliance verification",
+    "🎯 **Targets**: Set science-based targets aligned with Paris Agreement goals",
+    "💼 **Corporate Responsibility**: Develop comprehensive sustainability reporting",
+    "🌍 **International Standards**: Consider ISO 14001 environmental management certification"
+)
+
+METAL_RECOMMENDATIONS = {
+    'Aluminum': (
+        "⚡ Aluminum recycling uses 95% less energy than primary production",
+        "🔋 Consider using hydroelectric power for smelting operations",
+        "🏭 Implement advanced sorting technologies for scrap aluminum"
+    ),
+    'Steel': (
+        "🔥 Electric arc furnaces are more efficient for steel recycling",
+        "💨 Implement blast furnace gas recovery systems",
+        "🧲 Use magnetic separation for improved scrap quality"
+    ),
+    'Copper': (
+        "⚡ Copper has excellent recycling properties with minimal quality loss",
+        "🔧 Focus on improving scrap collection and sorting systems",
+        "🏭 Consider hydrometallurgical processes for complex ores"
+    )
+}
+
+PROCESS_RECOMMENDATIONS = {
+    'Primary Production': (
+        "🌱 Transition to renewable energy sources",
+        "⚙️ Optimize extraction and processing efficiency",
+        "💧 Implement water recycling systems"
+    ),
+    'Secondary Production (Recycling)': (
+        "🔄 Excellent choice for environmental sustainability",
+        "📊 Focus on improving sorting and contamination removal",
+        "🎯 Maintain high recycling rates through quality control"
+    ),
+    'Hybrid Process': (
+        "⚖️ Balance virgin and recycled materials for optimal performance",
+        "🔬 Monitor material quality throughout the process",
+        "📈 Gradually increase recycled content percentage"
+    )
+}
+
+TECHNOLOGY_GENERAL_MESSAGES = (
+    "🏭 **Industry 4.0**: Adopt digital manufacturing technologies",
+    "📊 **Analytics**: Implement predictive analytics for process optimization",
+    "🌐 **Digital Twin**: Develop digital twin models for process simulation"
+)
+
+# Complete recommendation tuples for every bucket combination, built once at import so the
+# getters return an existing tuple instead of assembling a new list per call.
+# Environmental: indexed by energy * 9 + emissions * 3 + water
+_ENVIRONMENTAL_MESSAGE_TABLE = tuple(
+    energy + emissions + water + ENVIRONMENTAL_GENERAL_MESSAGES
+    for energy in ENERGY_MESSAGES
+    for emissions in EMISSIONS_MESSAGES
+    for water in WATER_MESSAGES
+)
+
+# Circularity: indexed by circularity * 9 + recycled * 3 + reuse
+_CIRCULARITY_MESSAGE_TABLE = tuple(
+    circularity + recycled + reuse + CIRCULARITY_GENERAL_MESSAGES
+    for circularity in CIRCULARITY_MESSAGES
+    for recycled in RECYCLED_MESSAGES
+    for reuse in REUSE_MESSAGES
+)
+
+# Technology: indexed by energy * 4 + emissions * 2 + circularity
+_TECHNOLOGY_MESSAGE_TABLE = tuple(
+    energy + emissions + circularity + TECHNOLOGY_GENERAL_MESSAGES
+    for energy in TECH_ENERGY_MESSAGES
+    for emissions in TECH_EMISSIONS_MESSAGES
+    for circularity in TECH_CIRCULARITY_MESSAGES
+)
+
+# The same combinations pre-joined into the single Markdown block the app renders
+_ENVIRONMENTAL_MARKDOWN_TABLE = tuple('\n\n'.join(messages) for messages in _ENVIRONMENTAL_MESSAGE_TABLE)
+_CIRCULARITY_MARKDOWN_TABLE = tuple('\n\n'.join(messages) for messages in _CIRCULARITY_MESSAGE_TABLE)
+
+def _bucket(thresholds, value, side='left'):
+    """Index of the threshold bucket a value falls into"""
+    return int(np.searchsorted(thresholds, value, side=side))
+
+def _environmental_code(predictions):
+    """Index of the predictions' energy/emissions/water bucket combination"""
+    p = _as_vec(predictions)
+    return (
+        _bucket(ENERGY_THRESHOLDS, p.energy) * 9 +
+        _bucket(EMISSIONS_THRESHOLDS, p.emissions) * 3 +
+        _bucket(WATER_THRESHOLDS, p.water)
+    )
+
 def get_environmental_recommendations(predictions):
     """Generate environmental improvement recommendations based on predictions"""
-    recommendations = []
-    
-    # Extract environmental values
-    energy = predictions.get('Energy_Use_MJ_per_kg', 0)
-    emissions = predictions.get('Emission_kgCO2_per_kg', 0)
-    water = predictions.get('Water_Use_l_per_kg', 0)
-    
-    # Energy recommendations
-    if energy > 150:
-        recommendations.append("🔥 **High Energy Usage**: Consider switching to renewable energy sources or optimizing process efficiency")
-        recommendations.append("⚡ Implement energy recovery systems to capture and reuse waste heat")
-    elif energy > 100:
-        recommendations.append("💡 **Moderate Energy Usage**: Look into energy-efficient equipment upgrades")
-    else:
-        recommendations.append("✅ **Good Energy Performance**: Current energy usage is within acceptable limits")
-    
-    # Emissions recommendations
-    if emissions > 15:
-        recommendations.append("🌫️ **High CO₂ Emissions**: Urgent need to implement carbon capture technologies")
-        recommendations.append("🌱 Consider switching to low-carbon production methods or renewable energy")
-    elif emissions > 10:
-        recommendations.append("📉 **Moderate Emissions**: Implement emission reduction strategies like process optimization")
-    else:
-        recommendations.append("🌿 **Low Emissions**: Excellent carbon performance, maintain current practices")
+    # Energy, emissions and water recommendations followed by the general ones
+    return _ENVIRONMENTAL_MESSAGE_TABLE[_environmental_code(predictions)]
+
+def get_environmental_recommendations_markdown(predictions):
+    """Environmental recommendations as one pre-joined Markdown block"""
+    return _ENVIRONMENTAL_MARKDOWN_TABLE[_environmental_code(predictions)]
+
+def get_environmental_recommendations_batch(predictions_df):
+    """Environmental recommendations for every row of a predictions DataFrame, one tuple per row"""
+    n_rows = len(predictions_df)
     
-    # Water usage recommendations
-    if water > 80:
-        recommendations.append("💧 **High Water Usage**: Implement water recycling and closed-loop systems")
-        recommendations.append("🔄 Consider dry processing methods where technically feasible")
-    elif water > 50:
-        recommendations.append("💦 **Moderate Water Usage**: Optimize water efficiency in production processes")
-    else:
-        recommendations.append("💙 **Efficient Water Use**: Good water management practices in place")
+    def column(name):
+        # Missing columns score as 0, like the scalar version's .get(..., 0)
+        if name in predictions_df:
+            return predictions_df[name].to_numpy(dtype=np.float64)
+        return np.zeros(n_rows)
     
-    # General environmental recommendations
-    recommendations.append("🏭 **Process Optimization**: Regular maintenance and process tuning can reduce all environmental impacts")
-    recommendations.append("📊 **Monitoring**: Implement real-time monitoring systems for continuous improvement")
+    # One bucket vector per metric, combined into a single index into the message table
+    codes = (
+        np.searchsorted(ENERGY_THRESHOLDS, column('Energy_Use_MJ_per_kg')) * 9 +
+        np.searchsorted(EMISSIONS_THRESHOLDS, column('Emission_kgCO2_per_kg')) * 3 +
+        np.searchsorted(WATER_THRESHOLDS, column('Water_Use_l_per_kg'))
+    )
     
-    return recommendations
+    return [_ENVIRONMENTAL_MESSAGE_TABLE[code] for code in codes.tolist()]
+
+def _circularity_code(predictions):
+    """Index of the predictions' circularity/recycled/reuse bucket combination"""
+    p = _as_vec(predictions)
+    return (
+        _bucket(CIRCULARITY_THRESHOLDS, p.circularity, 'right') * 9 +
+        _bucket(RECYCLED_THRESHOLDS, p.recycled_pct, 'right') * 3 +
+        _bucket(REUSE_THRESHOLDS, p.reuse, 'right')
+    )
 
 def get_circularity_recommendations(predictions):
     """Generate circularity improvement recommendations based on predictions"""
-    recommendations = []
-    
-    # Extract circularity values
-    circularity_index = predictions.get('Circularity_Index', 0)
-    recycled_content = predictions.get('Recycled_Content_pct', 0)
-    reuse_potential = predictions.get('Reuse_Potential_score', 0)
-    
-    # Circularity Index recommendations
-    if circularity_index < 0.3:
-        recommendations.append("♻️ **Low Circularity**: Major improvements needed in circular design principles")
-        recommendations.append("🔄 Focus on design for disassembly and material recovery")
-        recommendations.append("🎯 Set targets for increasing material circularity by 25% within 2 years")
-    elif circularity_index < 0.6:
-        recommendations.append("📈 **Moderate Circularity**: Good foundation, aim for further improvements")
-        recommendations.append("🔧 Enhance product durability and repairability features")
-    else:
-        recommendations.append("🏆 **Excellent Circularity**: Leading circular economy practices")
-    
-    # Recycled Content recommendations
-    if recycled_content < 20:
-        recommendations.append("📦 **Low Recycled Content**: Increase use of secondary raw materials")
-        recommendations.append("🤝 Establish partnerships with recycling companies for material supply")
-        recommendations.append("🎯 Target minimum 30% recycled content in production")
-    elif recycled_content < 50:
-        recommendations.append("♻️ **Moderate Recycling**: Continue increasing recycled material usage")
-        recommendations.append("🔍 Identify opportunities to substitute virgin materials with recycled alternatives")
-    else:
-        recommendations.append("🌟 **High Recycled Content**: Excellent use of secondary materials")
-    
-    # Reuse Potential recommendations
-    if reuse_potential < 0.3:
-        recommendations.append("🔧 **Low Reuse Potential**: Design products for multiple life cycles")
-        recommendations.append("📝 Develop take-back programs for end-of-life products")
-        recommendations.append("🏗️ Create modular designs that enable component reuse")
-    elif reuse_potential < 0.6:
-        recommendations.append("🔄 **Moderate Reuse**: Enhance product design for better reusability")
-        recommendations.append("📋 Implement product-as-a-service models")
-    else:
-        recommendations.append("🎉 **High Reuse Potential**: Excellent design for reusability")
-    
-    # Specific improvement strategies
-    recommendations.append("🏭 **Supply Chain**: Collaborate with suppliers to improve material traceability")
-    recommendations.append("📱 **Digital Tools**: Implement digital passports for material tracking")
-    recommendations.append("🎓 **Training**: Educate staff on circular economy principles and practices")
-    
-    return recommendations
+    # Circularity Index, recycled content and reuse potential recommendations,
+    # followed by the specific improvement strategies
+    return _CIRCULARITY_MESSAGE_TABLE[_circularity_code(predictions)]
+
+def get_circularity_recommendations_markdown(predictions):
+    """Circularity recommendations as one pre-joined Markdown block"""
+    return _CIRCULARITY_MARKDOWN_TABLE[_circularity_code(predictions)]
 
 def get_process_specific_recommendations(metal_type, process_type):
     """Generate recommendations specific to metal type and process"""
-    recommendations = []
-    
-    # Metal-specific recommendations
-    metal_recommendations = {
-        'Aluminum': [
-            "⚡ Aluminum recycling uses 95% less energy than primary production",
-            "🔋 Consider using hydroelectric power for smelting operations",
-            "🏭 Implement advanced sorting technologies for scrap aluminum"
-        ],
-        'Steel': [
-            "🔥 Electric arc furnaces are more efficient for steel recycling",
-            "💨 Implement blast furnace gas recovery systems",
-            "🧲 Use magnetic separation for improved scrap quality"
-        ],
-        'Copper': [
-            "⚡ Copper has excellent recycling properties with minimal quality loss",
-            "🔧 Focus on improving scrap collection and sorting systems",
-            "🏭 Consider hydrometallurgical processes for complex ores"
-        ]
-    }
-    
-    # Process-specific recommendations
-    process_recommendations = {
-        'Primary Production': [
-            "🌱 Transition to renewable energy sources",
-            "⚙️ Optimize extraction and processing efficiency",
-            "💧 Implement water recycling systems"
-        ],
-        'Secondary Production (Recycling)': [
-            "🔄 Excellent choice for environmental sustainability",
-            "📊 Focus on improving sorting and contamination removal",
-            "🎯 Maintain high recycling rates through quality control"
-        ],
-        'Hybrid Process': [
-            "⚖️ Balance virgin and recycled materials for optimal performance",
-            "🔬 Monitor material quality throughout the process",
-            "📈 Gradually increase recycled content percentage"
-        ]
-    }
-    
-    # Add metal-specific recommendations
-    if metal_type in metal_recommendations:
-        recommendations.extend(metal_recommendations[metal_type])
-    
-    # Add process-specific recommendations
-    if process_type in process_recommendations:
-        recommendations.extend(process_recommendations[process_type])
-    
-    return recommendations
+    # Metal-specific recommendations followed by process-specific ones
+    return METAL_RECOMMENDATIONS.get(metal_type, ()) + PROCESS_RECOMMENDATIONS.get(process_type, ())
 
 def get_cost_optimization_recommendations(cost_per_kg, predictions):
     """Generate cost optimization recommendations"""
     recommendations = []
+    p = _as_vec(predictions)
     
-    energy = predictions.get('Energy_Use_MJ_per_kg', 0)
-    recycled_content = predictions.get('Recycled_Content_pct', 0)
-    
-    if cost_per_kg > 10:
-        recommendations.append("💰 **High Production Cost**: Focus on cost reduction strategies")
-        if energy > 100:
+    cost_bucket = _bucket(COST_THRESHOLDS, cost_per_kg)
+    recommendations.extend(COST_MESSAGES[cost_bucket])
+    if cost_bucket == 2:
+        if p.energy > 100:
             recommendations.append("⚡ Energy costs are likely significant - invest in efficiency improvements")
-        if recycled_content < 30:
+        if p.recycled_pct < 30:
             recommendations.append("♻️ Increase recycled content to reduce raw material costs")
-    elif cost_per_kg > 5:
-        recommendations.append("💵 **Moderate Cost**: Look for incremental cost improvements")
-        recommendations.append("📊 Benchmark against industry standards for cost optimization")
-    else:
-        recommendations.append("✅ **Cost Efficient**: Maintain current cost-effective practices")
     
     # General cost optimization strategies
-    recommendations.extend([
-        "🤖 **Automation**: Consider automation for labor-intensive processes",
-        "📈 **Scale**: Evaluate opportunities for economies of scale",
-        "🔗 **Supply Chain**: Optimize supply chain logistics and inventory management"
-    ])
+    recommendations.extend(COST_GENERAL_MESSAGES)
     
-    return recommendations
+    return tuple(recommendations)
 
 def get_regulatory_compliance_recommendations():
     """Generate recommendations for regulatory compliance"""
-    recommendations = [
-        "📋 **Environmental Regulations**: Ensure compliance with local emission standards",
-        "♻️ **Waste Regulations**: Follow proper waste management and reporting requirements",
-        "🏭 **Industrial Standards**: Maintain compliance with industry-specific regulations",
-        "📊 **Reporting**: Implement systematic environmental reporting and documentation",
-        "🔍 **Auditing**: Regular third-party environmental audits for compliance verification",
-        "🎯 **Targets**: Set science-based targets aligned with Paris Agreement goals",
-        "💼 **Corporate Responsibility**: Develop comprehensive sustainability reporting",
-        "🌍 **International Standards**: Consider ISO 14001 environmental management certification"
-    ]
-    
-    return recommendations
+    return REGULATORY_COMPLIANCE_MESSAGES
 
 def get_technology_recommendations(predictions):
     """Generate technology upgrade recommendations based on performance"""
-    recommendations = []
-    
-    energy = predictions.get('Energy_Use_MJ_per_kg', 0)
-    emissions = predictions.get('Emission_kgCO2_per_kg', 0)
-    circularity_index = predictions.get('Circularity_Index', 0)
-    
-    # Energy-based technology recommendations
-    if energy > 120:
-        recommendations.extend([
-            "🔋 **Energy Storage**: Implement battery systems for load balancing",
-            "🌡️ **Heat Recovery**: Install waste heat recovery systems",
-            "⚡ **Smart Grid**: Connect to smart grid for optimal energy management"
-        ])
-    
-    # Emissions-based technology recommendations
-    if emissions > 12:
-        recommendations.extend([
-            "🌿 **Carbon Capture**: Consider CO₂ capture and utilization technologies",
-            "🔬 **Process Innovation**: Invest in low-carbon process technologies",
-            "📡 **Monitoring**: Deploy continuous emissions monitoring systems"
-        ])
-    
-    # Circularity-based technology recommendations
-    if circularity_index < 0.4:
-        recommendations.extend([
-            "🤖 **AI Sorting**: Implement AI-powered material sorting systems",
-            "📱 **Blockchain**: Use blockchain for material traceability",
-            "🔧 **IoT Sensors**: Deploy IoT for real-time process monitoring"
-        ])
-    
-    # General technology recommendations
-    recommendations.extend([
-        "🏭 **Industry 4.0**: Adopt digital manufacturing technologies",
-        "📊 **Analytics**: Implement predictive analytics for process optimization",
-        "🌐 **Digital Twin**: Develop digital twin models for process simulation"
-    ])
+    p = _as_vec(predictions)
     
-    return recommendations
\ No newline at end of file
+    # Energy, emissions and circularity based technology recommendations,
+    # followed by the general ones
+    return _TECHNOLOGY_MESSAGE_TABLE[
+        _bucket(TECH_ENERGY_THRESHOLDS, p.energy) * 4 +
+        _bucket(TECH_EMISSIONS_THRESHOLDS, p.emissions) * 2 +
+        _bucket(TECH_CIRCULARITY_THRESHOLDS, p.circularity, 'right')
+    ]
\ No newline at end of file
@@ -3,72 +3,131 @@ Robust Model Loading System for Railway Deployment
 Handles Git LFS issues and provides fallback mechanisms
 """
 
+import functools
 import joblib
-import pickle
 import numpy as np
-import pandas as pd
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split
 from pathlib import Path
-import requests
 import os
 import streamlit as st
 
+# Candidate model files in priority order
+MODEL_CANDIDATES = (
+    "corrected_optimized_dual_target_model.pkl",
+    "clean_optimized_dual_target_model.pkl",
+    "lca_model.pkl"
+)
+
+# Directories searched for each candidate, in priority order
+MODEL_DIRS = ("models", "../models")
+
+# Files at least this large cannot be Git LFS pointers
+LFS_POINTER_MAX_SIZE = 1024
+LFS_INDICATORS = ('version https://git-lfs.github.com', 'oid sha256:', 'size ')
+
+@functools.lru_cache(maxsize=None)
+def _is_lfs_pointer(path, mtime):
+    """Whether a small file is a Git LFS pointer; keyed on mtime so a pulled file is re-checked"""
+    try:
+        # Check first few lines to see if it's a Git LFS pointer
+        with open(path, 'rb') as f:
+            first_bytes = f.read(200).decode('utf-8', errors='ignore')
+    except OSError:
+        return False
+    return any(indicator in first_bytes for indicator in LFS_INDICATORS)
+
+
+def export_onnx_estimators(model_data, model_path):
+    """Export the environmental and best circularity estimators of an optimized bundle to ONNX
+
+    Run at training time (requires skl2onnx); ModelLoader picks the files up automatically.
+    """
+    from src.optimized_model import export_onnx_estimators as export_estimators
+    
+    best_circ = model_data.get('circularity_best_model', 'RandomForest')
+    export_estimators(
+        model_data['environmental_model'],
+        model_data['circularity_models'][best_circ],
+        model_path
+    )
+
 class ModelLoader:
     """Robust model loader with fallback mechanisms"""
     
     def __init__(self):
-        self.model_paths = [
-            Path("models/corrected_optimized_dual_target_model.pkl"),
-            Path("../models/corrected_optimized_dual_target_model.pkl"),
-            Path("models/clean_optimized_dual_target_model.pkl"),
-            Path("../models/clean_optimized_dual_target_model.pkl"),
-            Path("models/lca_model.pkl"),
-            Path("../models/lca_model.pkl")
+        self.model_candidates = MODEL_CANDIDATES
+        self.model_dirs = MODEL_DIRS
+        # Status messages from the last load, rendered once per session by render_model_banner
+        self.messages = []
+    
+    def _notify(self, level, message):
+        """Record a status message instead of emitting it from inside the cached load"""
+        self.messages.append((level, message))
+    
+    def find_model_paths(self):
+        """List existing candidate model files in priority order using one scandir per directory"""
+        present = {}
+        for model_dir in self.model_dirs:
+            try:
+                with os.scandir(model_dir) as entries:
+                    present[model_dir] = {entry.name for entry in entries if entry.is_file()}
+            except OSError:
+                present[model_dir] = set()
+        
+        return [
+            Path(model_dir) / name
+            for name in self.model_candidates
+            for model_dir in self.model_dirs
+            if name in present[model_dir]
         ]
     
-    def check_git_lfs_files(self):
-        """Check if Git LFS files are properly downloaded"""
-        lfs_indicators = ['version https://git-lfs.github.com', 'oid sha256:', 'size ']
+    def check_git_lfs_files(self, model_paths=None):
+        """Check if Git LFS files are properly downloaded
+
+        Paths are checked in priority order and the check stops at the first real model file,
+        since that is the one load() will use.
+        """
+        if model_paths is None:
+            model_paths = self.find_model_paths()
         
-        for model_path in self.model_paths:
-            if model_path.exists():
-                try:
-                    # Check first few lines to see if it's a Git LFS pointer
-                    with open(model_path, 'rb') as f:
-                        first_bytes = f.read(200).decode('utf-8', errors='ignore')
-                        if any(indicator in first_bytes for indicator in lfs_indicators):
-                            st.warning(f"⚠️ {model_path.name} appears to be a Git LFS pointer, not actual model file")
-                            return False
-                except:
-                    continue
+        for model_path in model_paths:
+            try:
+                stat = model_path.stat()
+            except OSError:
+                continue
+            # LFS pointers are ~130 bytes, so anything larger is a real model without opening it
+            if stat.st_size >= LFS_POINTER_MAX_SIZE:
+                return True
+            if _is_lfs_pointer(str(model_path), stat.st_mtime):
+                self._notify('warning', f"⚠️ {model_path.name} appears to be a Git LFS pointer, not actual model file")
+                return False
+            return True
         return True
     
     def download_fallback_model(self):
         """Download a minimal working model if main models fail"""
         try:
-            st.info("📥 Downloading fallback model...")
+            self._notify('info', "📥 Downloading fallback model...")
             # This would normally download from a backup source
             # For now, we'll create a minimal model
             return self.create_minimal_model()
         except Exception as e:
-            st.error(f"Failed to download fallback model: {e}")
+            self._notify('error', f"Failed to download fallback model: {e}")
             return None
     
     def create_minimal_model(self):
         """Create a minimal working model for demonstration"""
-        st.info("🔧 Creating minimal demonstration model...")
+        self._notify('info', "🔧 Creating minimal demonstration model...")
         
         try:
             # Create synthetic training data matching the expected format
             np.random.seed(42)
             n_samples = 1000
             
-            # Generate synthetic features
-            X = np.random.rand(n_samples, 13)  # 13 features as expected
+            # Generate synthetic features (float32: trees split on float32 thresholds anyway)
+            X = np.random.rand(n_samples, 13).astype(np.float32)  # 13 features as expected
             
             # Generate synthetic targets (6 outputs)
-            y = np.random.rand(n_samples, 6)
+            y = np.random.rand(n_samples, 6).astype(np.float32)
             y[:, 0] = X[:, 0] * 100 + np.random.normal(0, 10, n_samples)  # Energy
             y[:, 1] = X[:, 1] * 20 + np.random.normal(0, 2, n_samples)   # Emissions
             y[:, 2] = X[:, 2] * 50 + np.random.normal(0, 5, n_samples)   # Water
@@ -76,9 +135,14 @@ class ModelLoader:
             y[:, 4] = X[:, 4] * 100  # Recycled Content
             y[:, 5] = np.clip(X[:, 5], 0, 1)  # Reuse Potential
             
-            # Train a simple model
-            model = RandomForestRegressor(n_estimators=10, random_state=42)
+            # Train a simple model (sklearn is only imported when the fallback is needed)
+            from sklearn.ensemble import RandomForestRegressor
+            model = RandomForestRegressor(
+                n_estimators=5, max_depth=8, max_features='sqrt', random_state=42, n_jobs=-1
+            )
             model.fit(X, y)
+            # The app predicts one row at a time, where a thread pool only adds overhead
+            model.n_jobs = 1
             
             # Create model data structure
             model_data = {
@@ -105,62 +169,88 @@ class ModelLoader:
                 ]
             }
             
-            st.success("✅ Minimal demonstration model created successfully")
-            st.info("📝 Note: This is a demonstration model. For production use, please ensure proper model files are available.")
+            self._notify('success', "✅ Minimal demonstration model created successfully")
+            self._notify('info', "📝 Note: This is a demonstration model. For production use, please ensure proper model files are available.")
             
             return model_data
             
         except Exception as e:
-            st.error(f"Failed to create minimal model: {e}")
+            self._notify('error', f"Failed to create minimal model: {e}")
             return None
     
     def load_model_file(self, model_path):
         """Load a single model file with error handling"""
         try:
-            # Try pickle first (for newer models)
-            if "optimized_dual_target" in model_path.name:
-                with open(model_path, 'rb') as f:
-                    return pickle.load(f)
-            else:
-                return joblib.load(model_path)
+            # joblib also reads the plain pickles the optimized models were saved as
+            return joblib.load(model_path)
         except Exception as e:
-            st.error(f"Error loading {model_path.name}: {str(e)}")
+            self._notify('error', f"Error loading {model_path.name}: {str(e)}")
             return None
     
+    def attach_onnx_estimators(self, model_data, model_path):
+        """Swap in ONNX Runtime estimators when exports exist next to the model file"""
+        if not isinstance(model_data, dict) or model_data.get('model_type') != 'optimized_dual_target':
+            return model_data
+        
+        # Shared with the standalone predictor; imported here so a plain load skips it
+        from src.optimized_model import ONNX_CIRC_SUFFIX, ONNX_ENV_SUFFIX, OnnxRegressor
+        
+        env_path = model_path.with_name(model_path.stem + ONNX_ENV_SUFFIX)
+        circ_path = model_path.with_name(model_path.stem + ONNX_CIRC_SUFFIX)
+        if not (env_path.is_file() and circ_path.is_file()):
+            return model_data
+        
+        try:
+            env_model = OnnxRegressor(env_path)
+            circ_model = OnnxRegressor(circ_path)
+        except Exception as e:
+            # onnxruntime missing or export unreadable: keep the sklearn estimators
+            self._notify('warning', f"⚠️ ONNX estimators not used: {e}")
+            return model_data
+        
+        best_circ = model_data.get('circularity_best_model', 'RandomForest')
+        model_data = dict(model_data)
+        model_data['environmental_model'] = env_model
+        model_data['circularity_models'] = dict(model_data['circularity_models'], **{best_circ: circ_model})
+        return model_data
+    
     def load(self):
         """Main model loading method with fallback chain"""
+        self.messages = []
         try:
+            model_paths = self.find_model_paths()
+            
             # Check if Git LFS files are properly downloaded
-            if not self.check_git_lfs_files():
-                st.warning("⚠️ Git LFS files may not be properly downloaded")
+            if not self.check_git_lfs_files(model_paths):
+                self._notify('warning', "⚠️ Git LFS files may not be properly downloaded")
             
             # Try to load existing models
-            for model_path in self.model_paths:
-                if model_path.exists():
-                    st.info(f"🔍 Attempting to load: {model_path.name}")
+            for model_path in model_paths:
+                self._notify('info', f"🔍 Attempting to load: {model_path.name}")
                     
-                    model_data = self.load_model_file(model_path)
-                    if model_data is not None:
-                        st.success(f"✅ Model loaded successfully from {model_path.name}")
+                model_data = self.load_model_file(model_path)
+                if model_data is not None:
+                    self._notify('success', f"✅ Model loaded successfully from {model_path.name}")
+                    model_data = self.attach_onnx_estimators(model_data, model_path)
                         
-                        # Display model information
-                        if isinstance(model_data, dict) and 'model_type' in model_data:
-                            st.info(f"📊 Model Type: {model_data['model_type']}")
-                            if 'metadata' in model_data:
-                                metadata = model_data['metadata']
-                                st.info(f"🔢 Version: {metadata.get('model_version', 'Unknown')}")
-                                st.success(f"✅ Feature Alignment: {metadata.get('feature_alignment', 'Unknown')}")
-                                st.info(f"🔧 Expected Features: {metadata.get('features_count', 'Unknown')}")
+                    # Display model information
+                    if isinstance(model_data, dict) and 'model_type' in model_data:
+                        self._notify('info', f"📊 Model Type: {model_data['model_type']}")
+                        if 'metadata' in model_data:
+                            metadata = model_data['metadata']
+                            self._notify('info', f"🔢 Version: {metadata.get('model_version', 'Unknown')}")
+                            self._notify('success', f"✅ Feature Alignment: {metadata.get('feature_alignment', 'Unknown')}")
+                            self._notify('info', f"🔧 Expected Features: {metadata.get('features_count', 'Unknown')}")
                         
-                        return model_data
+                    return model_data
             
             # If no models found or all failed, use fallback
-            st.warning("⚠️ No valid model files found. Creating fallback model...")
+            self._notify('warning', "⚠️ No valid model files found. Creating fallback model...")
             return self.create_minimal_model()
             
         except Exception as e:
-            st.error(f"❌ Critical error in model loading: {str(e)}")
-            st.info("🔧 Attempting to create fallback model...")
+            self._notify('error', f"❌ Critical error in model loading: {str(e)}")
+            self._notify('info', "🔧 Attempting to create fallback model...")
             return self.create_minimal_model()
 
 # Global model loader instance
@@ -169,4 +259,9 @@ _model_loader = ModelLoader()
 @st.cache_resource
 def load_robust_model():
     """Cached model loading with robust fallback"""
-    return _model_loader.load()
\ No newline at end of file
+    return _model_loader.load()
+
+def render_model_banner():
+    """Show the status messages recorded while loading the model"""
+    for level, message in _model_loader.messages:
+        getattr(st, level)(message)
\ No newline at end of file
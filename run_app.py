@@ -3,24 +3,23 @@
 LCA Metals Prediction System - Launcher Script
 """
 
+import importlib.util
 import subprocess
 import sys
 import os
 from pathlib import Path
 
+# Modules the app needs; only their presence is checked, the app imports them itself
+REQUIRED_MODULES = ("streamlit", "pandas", "plotly", "sklearn", "joblib")
+
 def check_dependencies():
-    """Check if required dependencies are installed"""
-    try:
-        import streamlit
-        import pandas
-        import plotly
-        import sklearn
-        import joblib
-        print("✅ All dependencies are installed")
-        return True
-    except ImportError as e:
-        print(f"❌ Missing dependency: {e}")
-        return False
+    """Check if required dependencies are installed without importing them"""
+    for name in REQUIRED_MODULES:
+        if importlib.util.find_spec(name) is None:
+            print(f"❌ Missing dependency: No module named '{name}'")
+            return False
+    print("✅ All dependencies are installed")
+    return True
 
 def install_dependencies():
     """Install required dependencies"""
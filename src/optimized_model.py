@@ -1,12 +1,118 @@
 
 # Enhanced LCA Prediction Function - Optimized for 90%+ Accuracy
-import pandas as pd
+import functools
+import json
+from pathlib import Path
 import numpy as np
 import joblib
+from sklearn.ensemble import ExtraTreesRegressor, RandomForestRegressor
 from sklearn.preprocessing import PolynomialFeatures
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Number of distinct single-sample inputs whose predictions are kept per predictor
+PREDICTION_CACHE_SIZE = 1024
+
+# Column order of the raw inputs accepted by predict_batch
+INPUT_COLUMNS = ('Metal_Type', 'Supply_Chain_Complexity', 'Production_Volume_tons', 'Processing_Method')
+NUMERICAL_FEATURES = ('Supply_Chain_Complexity', 'Production_Volume_tons')
+CATEGORICAL_FEATURES = ('Metal_Type', 'Processing_Method')
+
+# Positions of the feature groups within an input row, resolved once from the schema
+_NUMERICAL_IDX = [INPUT_COLUMNS.index(column) for column in NUMERICAL_FEATURES]
+_CATEGORICAL_IDX = [INPUT_COLUMNS.index(column) for column in CATEGORICAL_FEATURES]
+
+# Batches at least this large spread forest inference over all cores; smaller ones stay
+# serial because the thread pool start-up outweighs a few tree walks
+PARALLEL_PREDICT_MIN_ROWS = 64
+
+# Suffixes of the optional ONNX exports stored next to the model file
+ONNX_ENV_SUFFIX = "_environmental.onnx"
+ONNX_CIRC_SUFFIX = "_circularity.onnx"
+
+# Monomial exponents of a degree-2 PolynomialFeatures over two inputs, in sklearn's output order
+_DEGREE2_POWERS = ((0, 0), (1, 0), (0, 1), (2, 0), (1, 1), (0, 2))
+
+def _build_poly_expand(poly_transformer):
+    """Specialize a fitted two-input PolynomialFeatures into a plain function of (x0, x1)
+
+    The common degree-2 configurations get an inline expansion; any other fitted
+    configuration is evaluated from its powers_ table, and an unfitted or unexpected
+    transformer falls back to its own transform().
+    """
+    powers = getattr(poly_transformer, 'powers_', None)
+    if powers is None or powers.ndim != 2 or powers.shape[1] != 2:
+        return lambda x0, x1: poly_transformer.transform(
+            np.array([[x0, x1]], dtype=np.float64)
+        )[0]
+
+    powers_key = tuple(map(tuple, powers.tolist()))
+    if powers_key == _DEGREE2_POWERS:
+        return lambda x0, x1: (1.0, x0, x1, x0 * x0, x0 * x1, x1 * x1)
+    if powers_key == _DEGREE2_POWERS[1:]:
+        return lambda x0, x1: (x0, x1, x0 * x0, x0 * x1, x1 * x1)
+
+    powers = powers.astype(np.float64)
+    return lambda x0, x1: np.prod(np.array([x0, x1], dtype=np.float64) ** powers, axis=1)
+
+def _json_default(obj):
+    """Convert numpy scalars and arrays for the stdlib JSON encoder"""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    return str(obj)
+
+def dumps_metadata(metadata):
+    """Serialize model metadata to UTF-8 JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(
+            metadata,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+            default=_json_default
+        )
+    return json.dumps(metadata, default=_json_default).encode('utf-8')
+
+def _set_forest_jobs(model, n_rows):
+    """Parallelize a forest's predict() across cores only for large batches"""
+    if isinstance(model, (RandomForestRegressor, ExtraTreesRegressor)):
+        n_jobs = -1 if n_rows >= PARALLEL_PREDICT_MIN_ROWS else 1
+        if model.n_jobs != n_jobs:
+            model.n_jobs = n_jobs
+
+class OnnxRegressor:
+    """Inference-only stand-in for a fitted regressor backed by ONNX Runtime"""
+
+    def __init__(self, onnx_path):
+        import onnxruntime as ort
+        self.session = ort.InferenceSession(str(onnx_path), providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def predict(self, X):
+        # sklearn trees evaluate on float32 as well, so the cast does not change predictions
+        return self.session.run(None, {self.input_name: np.asarray(X, dtype=np.float32)})[0]
+
+def export_onnx_estimators(environmental_model, circularity_model, model_path):
+    """Export the environmental and circularity estimators to ONNX next to model_path
+
+    Requires skl2onnx; each export takes its input width from the estimator's n_features_in_.
+    """
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+
+    model_path = Path(model_path)
+    for estimator, suffix in (
+        (environmental_model, ONNX_ENV_SUFFIX),
+        (circularity_model, ONNX_CIRC_SUFFIX)
+    ):
+        initial_types = [('input', FloatTensorType([None, estimator.n_features_in_]))]
+        onnx_model = convert_sklearn(estimator, initial_types=initial_types)
+        with open(model_path.with_name(model_path.stem + suffix), 'wb') as f:
+            f.write(onnx_model.SerializeToString())
+
 class OptimizedLCAPredictor:
     def __init__(self, model_path=None):
         if model_path is None:
@@ -23,6 +129,17 @@ class OptimizedLCAPredictor:
             print(f"❌ Error loading model: {e}")
             raise
 
+        # Label -> code lookups so a single prediction never goes through LabelEncoder.transform
+        self._label_maps = {
+            column: dict(zip(encoder.classes_, range(len(encoder.classes_))))
+            for column, encoder in self.model_components['label_encoders'].items()
+        }
+        self._poly_expand = _build_poly_expand(self.model_components['poly_transformer'])
+        self._attach_onnx_models(Path(model_path))
+        self._metadata_json = None
+        # Per-instance cache, so reloading the model (a new predictor) starts from an empty cache
+        self._predict_cached = functools.lru_cache(maxsize=PREDICTION_CACHE_SIZE)(self._predict_uncached)
+
     def predict_single(self, metal_type, supply_chain_complexity, production_volume, processing_method):
         """
         Predict environmental and circularity indicators for a single sample
@@ -30,70 +147,166 @@ class OptimizedLCAPredictor:
         Returns:
         - Environmental predictions (Energy, Emissions, Water) - High accuracy (85%+)
         - Circularity predictions (Index, Content, Potential) - Optimized accuracy
+
+        Results are cached on the exact inputs.
         """
-        # Prepare input data
-        input_data = pd.DataFrame({
-            'Metal_Type': [metal_type],
-            'Supply_Chain_Complexity': [supply_chain_complexity],
-            'Production_Volume_tons': [production_volume],
-            'Processing_Method': [processing_method]
-        })
+        result = self._predict_cached(
+            metal_type, float(supply_chain_complexity), float(production_volume), processing_method
+        )
+        # Hand out a copy so callers cannot mutate the cached entry
+        return dict(result)
+
+    def clear_prediction_cache(self):
+        """Drop all cached predictions"""
+        self._predict_cached.cache_clear()
 
+    def _predict_uncached(self, metal_type, supply_chain_complexity, production_volume, processing_method):
         # Transform input
-        X_transformed = self._prepare_features(input_data)
+        X_transformed = self._prepare_features(
+            metal_type, supply_chain_complexity, production_volume, processing_method
+        )
 
-        # Environmental predictions
-        env_pred = self.model_components['environmental_model'].predict(X_transformed)
+        # Format results
+        all_predictions = self._predict_transformed(X_transformed)[0]
+        return {target: float(value) for target, value in zip(self.target_names, all_predictions)}
+
+    def predict_batch(self, X):
+        """
+        Predict environmental and circularity indicators for many samples at once
+
+        X is either a DataFrame with the INPUT_COLUMNS columns, or an (N, 4) array with
+        columns in INPUT_COLUMNS order; categorical columns hold the raw labels. Each model
+        is called once for the whole batch. A DataFrame input returns a DataFrame with one
+        column per target; an array input returns an (N, n_targets) array in target_names order.
+        """
+        if hasattr(X, 'columns'):
+            import pandas as pd
+            predictions = self._predict_transformed(
+                self._prepare_batch_features(X[list(INPUT_COLUMNS)].to_numpy(dtype=object))
+            )
+            return pd.DataFrame(predictions, columns=self.target_names, index=X.index)
+        return self._predict_transformed(self._prepare_batch_features(X))
+
+    def export_onnx_models(self, model_path=None):
+        """Export the environmental and best circularity models to ONNX next to the model file
+
+        Run once after training (requires skl2onnx); later predictors pick the files up automatically.
+        """
+        export_onnx_estimators(
+            self.model_components['environmental_model'],
+            self._best_circularity_model(),
+            model_path or self.model_path
+        )
+
+    def _attach_onnx_models(self, model_path):
+        """Route predictions through ONNX Runtime when exports exist; keep sklearn otherwise"""
+        self.model_path = model_path
+        env_path = model_path.with_name(model_path.stem + ONNX_ENV_SUFFIX)
+        circ_path = model_path.with_name(model_path.stem + ONNX_CIRC_SUFFIX)
+        if not (env_path.is_file() and circ_path.is_file()):
+            return
+
+        try:
+            env_model = OnnxRegressor(env_path)
+            circ_model = OnnxRegressor(circ_path)
+        except Exception as e:
+            print(f"⚠️ ONNX models not used: {e}")
+            return
+
+        best_circ = self.model_components['circularity_best_model']
+        self.model_components = dict(self.model_components)
+        self.model_components['environmental_model'] = env_model
+        self.model_components['circularity_models'] = dict(
+            self.model_components['circularity_models'], **{best_circ: circ_model}
+        )
+        print("⚡ Using ONNX Runtime for inference")
 
-        # Circularity predictions  
-        best_circ_model = self.model_components['circularity_models'][
+    def _best_circularity_model(self):
+        return self.model_components['circularity_models'][
             self.model_components['circularity_best_model']
         ]
 
-        if hasattr(best_circ_model, 'predict'):
-            circ_pred = best_circ_model.predict(X_transformed)
-        else:
-            # MultiOutputRegressor
-            circ_pred = best_circ_model.predict(X_transformed)
+    @property
+    def target_names(self):
+        return self.model_components['environmental_targets'] + self.model_components['circularity_targets']
+
+    def _predict_transformed(self, X_transformed):
+        """Run both models over a prepared feature matrix, one predict() call each"""
+        env_model = self.model_components['environmental_model']
+        circ_model = self._best_circularity_model()
+        for model in (env_model, circ_model):
+            _set_forest_jobs(model, len(X_transformed))
+
+        # Environmental predictions
+        env_pred = env_model.predict(X_transformed)
+
+        # Circularity predictions
+        circ_pred = circ_model.predict(X_transformed)
 
         # Combine predictions
-        all_predictions = np.concatenate([env_pred[0], circ_pred[0]])
+        return np.hstack([
+            np.asarray(env_pred).reshape(len(X_transformed), -1),
+            np.asarray(circ_pred).reshape(len(X_transformed), -1)
+        ])
 
-        # Format results
-        results = {}
-        all_targets = self.model_components['environmental_targets'] + self.model_components['circularity_targets']
+    def _encode(self, column, value):
+        """Label-encode one categorical value; columns without an encoder pass through"""
+        label_map = self._label_maps.get(column)
+        if label_map is None:
+            return value
+        try:
+            return label_map[value]
+        except KeyError:
+            raise ValueError(f"{column} contains previously unseen label: {value!r}") from None
+
+    def _encode_many(self, column, values):
+        """Label-encode a column of values with one dict lookup per distinct label"""
+        label_map = self._label_maps.get(column)
+        if label_map is None:
+            return values.astype(np.float64)
+        uniques, inverse = np.unique(values, return_inverse=True)
+        codes = np.array([self._encode(column, value) for value in uniques], dtype=np.float64)
+        return codes[inverse.reshape(-1)]
 
-        for i, target in enumerate(all_targets):
-            results[target] = float(all_predictions[i])
+    def _prepare_features(self, metal_type, supply_chain_complexity, production_volume, processing_method):
+        # Apply polynomial transformation to the numerical features
+        poly_features = self._poly_expand(float(supply_chain_complexity), float(production_volume))
 
-        return results
+        # Combine features: polynomial terms followed by the encoded categoricals
+        n_poly = len(poly_features)
+        X_transformed = np.empty((1, n_poly + 2), dtype=np.float64)
+        X_transformed[0, :n_poly] = poly_features
+        X_transformed[0, n_poly] = self._encode('Metal_Type', metal_type)
+        X_transformed[0, n_poly + 1] = self._encode('Processing_Method', processing_method)
 
-    def _prepare_features(self, input_df):
-        # Apply label encoding
-        for column, encoder in self.model_components['label_encoders'].items():
-            if column in input_df.columns:
-                input_df[column] = encoder.transform(input_df[column])
+        return X_transformed
 
-        # Get numerical features
-        numerical_features = ['Supply_Chain_Complexity', 'Production_Volume_tons']
-        categorical_features = ['Metal_Type', 'Processing_Method']
+    def _prepare_batch_features(self, X):
+        X = np.asarray(X)
+        if X.ndim != 2 or X.shape[1] != len(INPUT_COLUMNS):
+            raise ValueError(f"Expected an (N, {len(INPUT_COLUMNS)}) array with columns {INPUT_COLUMNS}")
 
-        # Apply polynomial transformation
+        # Polynomial transformation of the whole numerical block at once
         poly_features = self.model_components['poly_transformer'].transform(
-            input_df[numerical_features]
+            X[:, _NUMERICAL_IDX].astype(np.float64)
         )
 
-        # Combine features
-        X_transformed = np.concatenate([
-            poly_features,
-            input_df[categorical_features].values
-        ], axis=1)
+        encoded = np.column_stack([
+            self._encode_many(column, X[:, idx])
+            for column, idx in zip(CATEGORICAL_FEATURES, _CATEGORICAL_IDX)
+        ])
 
-        return X_transformed
+        return np.hstack([poly_features, encoded])
 
     def get_model_info(self):
         return self.metadata
 
+    def get_model_info_json(self):
+        """Metadata as JSON bytes, serialized once per predictor"""
+        if self._metadata_json is None:
+            self._metadata_json = dumps_metadata(self.metadata)
+        return self._metadata_json
+
 # Example usage and testing
 if __name__ == "__main__":
     try:
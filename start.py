@@ -4,44 +4,130 @@ Railway Streamlit Startup Script
 Handles PORT environment variable and model checking for Railway deployment
 """
 
+import json
+import mmap
 import os
+import re
+import shutil
+import signal
 import subprocess
 import sys
-from pathlib import Path
+import tempfile
+
+def streamlit_launcher():
+    """Streamlit's console script next to this interpreter, or python -m streamlit without one
+
+    Only the interpreter's own bin directory is searched, so the script always belongs to
+    the same environment; running it directly skips runpy's module lookup.
+    """
+    script = shutil.which('streamlit', path=os.path.dirname(sys.executable))
+    if script:
+        return (script,)
+    return (sys.executable, '-m', 'streamlit')
+
+# 1-5 digits without a leading zero; the upper bound 65535 is checked separately
+PORT_RE = re.compile(r'[1-9][0-9]{0,4}\Z')
+
+# Streamlit command line without the port; the file watcher is off since deployed code never changes
+STREAMLIT_ARGV = (
+    *streamlit_launcher(), 'run', 'app/app.py',
+    '--server.address', '0.0.0.0',
+    '--server.headless', 'true',
+    '--server.enableCORS', 'false',
+    '--server.enableXsrfProtection', 'false',
+    '--server.maxUploadSize', '200',
+    '--server.fileWatcherType', 'none',
+    '--global.developmentMode', 'false'
+)
+
+# Git LFS pointers are ~130 bytes; anything this large is a real model file
+LFS_POINTER_MAX_SIZE = 1024
+# Every pointer starts with this line (alongside its oid and size lines), so one search suffices
+LFS_SIGNATURE = b'version https://git-lfs.github.com'
+
+# Per-file LFS verdicts from earlier starts: name -> [size, mtime_ns, is_lfs_pointer];
+# kept in the temp directory so the tracked models/ directory stays clean
+MODEL_MANIFEST = os.path.join(tempfile.gettempdir(), "lca_model_manifest.json")
+
+def load_manifest():
+    try:
+        with open(MODEL_MANIFEST, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(manifest):
+    try:
+        with open(MODEL_MANIFEST, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(manifest, separators=(',', ':')))
+    except OSError:
+        # Read-only image: the verdicts are simply recomputed next start
+        pass
+
+def is_lfs_pointer(model_file, manifest):
+    """Classify a model file, reusing the manifest verdict while its size and mtime are unchanged"""
+    stat = model_file.stat()
+    cached = manifest.get(model_file.name)
+    if cached is not None and cached[:2] == [stat.st_size, stat.st_mtime_ns]:
+        return cached[2]
+    
+    # Only small files can be pointers, so only they need their bytes read
+    pointer = False
+    if 0 < stat.st_size < LFS_POINTER_MAX_SIZE:
+        with open(model_file.path, 'rb') as f, \
+                mmap.mmap(f.fileno(), min(200, stat.st_size), access=mmap.ACCESS_READ) as mm:
+            pointer = mm.find(LFS_SIGNATURE) != -1
+    manifest[model_file.name] = [stat.st_size, stat.st_mtime_ns, pointer]
+    return pointer
 
 def check_models():
     """Check if model files are available and valid"""
     print("🔍 Checking model files...")
     
-    models_dir = Path("models")
-    if not models_dir.exists():
+    try:
+        with os.scandir("models") as entries:
+            model_files = [entry for entry in entries if entry.name.endswith('.pkl') and entry.is_file()]
+    except OSError:
         print("⚠️  Models directory not found - application will use fallback models")
         return False
     
-    model_files = list(models_dir.glob("*.pkl"))
     if not model_files:
         print("⚠️  No model files found - application will use fallback models")
         return False
     
-    # Check if files are Git LFS pointers
-    lfs_indicators = [b'version https://git-lfs.github.com', b'oid sha256:', b'size ']
-    
-    for model_file in model_files:
-        try:
-            with open(model_file, 'rb') as f:
-                first_bytes = f.read(200)
-                if any(indicator in first_bytes for indicator in lfs_indicators):
+    manifest = load_manifest()
+    known = dict(manifest)
+    try:
+        # Check if files are Git LFS pointers
+        for model_file in model_files:
+            try:
+                if is_lfs_pointer(model_file, manifest):
                     print(f"⚠️  {model_file.name} appears to be a Git LFS pointer")
                     print("💡 Application will create fallback demonstration models")
                     return False
-                else:
-                    print(f"✅ {model_file.name} appears to be a valid model file")
-        except Exception as e:
-            print(f"⚠️  Could not read {model_file.name}: {e}")
+                print(f"✅ {model_file.name} appears to be a valid model file")
+            except Exception as e:
+                print(f"⚠️  Could not read {model_file.name}: {e}")
+    finally:
+        if manifest != known:
+            save_manifest(manifest)
     
     return True
 
+def pin_cpus(count=2):
+    """Restrict this process (and the Streamlit it becomes) to the first allowed CPUs"""
+    if not hasattr(os, 'sched_setaffinity'):
+        return
+    allowed = sorted(os.sched_getaffinity(0))
+    if len(allowed) > count:
+        os.sched_setaffinity(0, allowed[:count])
+        print(f"📌 Pinned to CPUs: {allowed[:count]}")
+
 def main():
+    # Buffer the startup messages and write them out in one go before launching, rather
+    # than one write per print on the unbuffered (PYTHONUNBUFFERED) container stdout
+    sys.stdout.reconfigure(line_buffering=False, write_through=False)
+    
     print("🚀 Starting LCA-Mining Streamlit App on Railway...")
     
     # Check model files
@@ -55,38 +141,37 @@ def main():
     port = os.environ.get('PORT', '8501')
     print(f"✅ Using PORT: {port}")
     
-    # Validate port is numeric
-    try:
-        port_int = int(port)
-        if port_int < 1 or port_int > 65535:
-            raise ValueError("Port out of range")
-    except ValueError:
+    # Validate port is a number in 1-65535
+    if not PORT_RE.match(port) or int(port) > 65535:
         print(f"❌ Invalid PORT value: {port}, using default 8501")
         port = '8501'
     
     # Build streamlit command
-    cmd = [
-        sys.executable, '-m', 'streamlit', 'run', 'app/app.py',
-        '--server.port', port,
-        '--server.address', '0.0.0.0',
-        '--server.headless', 'true',
-        '--server.enableCORS', 'false',
-        '--server.enableXsrfProtection', 'false',
-        '--server.maxUploadSize', '200'
-    ]
+    cmd = (*STREAMLIT_ARGV, '--server.port', port)
     
     print(f"🌐 Starting Streamlit server on port {port}...")
     print(f"Command: {' '.join(cmd)}")
     
-    # Execute streamlit
-    try:
-        subprocess.run(cmd, check=True)
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Streamlit failed to start: {e}")
+    # Optionally keep Streamlit's mostly single-threaded event loop on a couple of cores
+    if os.environ.get('PIN_CPUS') == '1':
+        pin_cpus()
+    
+    # Push the startup messages out before Streamlit starts writing (exec would discard them)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    
+    # Replace this process with Streamlit: no extra parent to hold memory or forward
+    # signals, and the platform supervisor manages Streamlit directly
+    if os.name == 'posix':
+        os.execv(cmd[0], cmd)
+    
+    # Windows has no in-place exec; run Streamlit as a child instead. Ctrl+C reaches the
+    # child directly from the console, so the parent ignores it and just waits for the exit
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    returncode = subprocess.run(cmd).returncode
+    if returncode != 0:
+        print(f"❌ Streamlit exited with status {returncode}")
         sys.exit(1)
-    except KeyboardInterrupt:
-        print("👋 Streamlit stopped by user")
-        sys.exit(0)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -2,6 +2,8 @@
 Test script for LCA Streamlit App
 """
 
+import functools
+import importlib
 import sys
 import os
 from pathlib import Path
@@ -9,53 +11,91 @@ from pathlib import Path
 # Add app directory to path
 sys.path.append(str(Path(__file__).parent / "app"))
 
+# Modules used by the tests, imported on first use so each test only pays for what it needs
+_modules = {}
+
+def _imp(name):
+    """Import a module once and reuse it across tests"""
+    module = _modules.get(name)
+    if module is None:
+        module = _modules[name] = importlib.import_module(name)
+    return module
+
 def test_imports():
     """Test if all required modules can be imported"""
     print("🧪 Testing imports...")
     
     try:
-        import streamlit as st
+        _imp('streamlit')
         print("✅ Streamlit import successful")
     except ImportError as e:
         print(f"❌ Streamlit import failed: {e}")
         return False
     
     try:
-        from app.plots import create_sankey_diagram, create_energy_comparison
+        plots = _imp('app.plots')
+        plots.create_sankey_diagram, plots.create_energy_comparison
         print("✅ Plots module import successful")
-    except ImportError as e:
+    except (ImportError, AttributeError) as e:
         print(f"❌ Plots module import failed: {e}")
         return False
     
     try:
-        from app.recommendations import get_environmental_recommendations
+        _imp('app.recommendations').get_environmental_recommendations
         print("✅ Recommendations module import successful")
-    except ImportError as e:
+    except (ImportError, AttributeError) as e:
         print(f"❌ Recommendations module import failed: {e}")
         return False
     
     return True
 
+# Sample inputs for the prediction check, one row per case, in the generic models' feature order
+SAMPLE_FEATURE_ORDER = (
+    'Metal', 'Process_Type', 'End_of_Life', 'Transport_km', 'Cost_per_kg',
+    'Product_Life_Extension_years', 'Waste_kg_per_kg_metal'
+)
+SAMPLE_ROWS = (
+    (0, 1, 0, 500.0, 5.0, 10.0, 0.3),
+    (1, 0, 1, 1200.0, 8.0, 5.0, 0.1),
+    (2, 2, 2, 50.0, 12.0, 20.0, 0.5)
+)
+
+@functools.cache
+def model_files():
+    """Model files in models/, listed once and shared by every test in this process"""
+    return tuple(Path("models").glob("*.pkl"))
+
+def load_model(model_path):
+    """Load a model with its numpy arrays memory-mapped, or fully for formats that can't be mapped"""
+    joblib = _imp('joblib')
+    
+    try:
+        return joblib.load(model_path, mmap_mode='r')
+    except ValueError:
+        return joblib.load(model_path)
+
+def get_estimator(model_data):
+    """Unwrap the estimator from a {'model': ...} bundle; bare estimators pass through"""
+    if isinstance(model_data, dict):
+        return model_data.get('model', model_data)
+    return model_data
+
 def test_model_loading():
     """Test model loading functionality"""
     print("\n🔍 Testing model loading...")
     
-    import joblib
-    from pathlib import Path
-    
     models_dir = Path("models")
     if not models_dir.exists():
         print("❌ Models directory not found")
         return False
     
-    model_files = list(models_dir.glob("*.pkl"))
-    if not model_files:
+    if not model_files():
         print("❌ No model files found")
         return False
     
     try:
-        model_path = model_files[0]  # Use first available model
-        model_data = joblib.load(model_path)
+        model_path = model_files()[0]  # Use first available model
+        model_data = load_model(model_path)
         print(f"✅ Model loaded from {model_path.name}")
         
         # Test model structure
@@ -75,35 +115,22 @@ def test_predictions():
     print("\n🔮 Testing predictions...")
     
     try:
-        # Sample input data
-        sample_input = {
-            'Metal': 0,
-            'Process_Type': 1,
-            'End_of_Life': 0,
-            'Transport_km': 500.0,
-            'Cost_per_kg': 5.0,
-            'Product_Life_Extension_years': 10.0,
-            'Waste_kg_per_kg_metal': 0.3
-        }
-        
-        import pandas as pd
-        import joblib
-        from pathlib import Path
+        np = _imp('numpy')
         
         # Load model
-        model_files = list(Path("models").glob("*.pkl"))
-        if model_files:
-            model_data = joblib.load(model_files[0])
+        if model_files():
+            model_data = load_model(model_files()[0])
             
-            # Extract model
-            if isinstance(model_data, dict) and 'model' in model_data:
-                model = model_data['model']
-            else:
-                model = model_data
+            model = get_estimator(model_data)
             
-            # Make prediction
-            input_df = pd.DataFrame([sample_input])
-            predictions = model.predict(input_df) # type: ignore
+            # All sample rows in one float32 matrix (the dtype the trees evaluate on),
+            # reordered when the model records its own feature order
+            X = np.array(SAMPLE_ROWS, dtype=np.float32)
+            if isinstance(model_data, dict) and 'feature_order' in model_data:
+                X = np.ascontiguousarray(X[:, [SAMPLE_FEATURE_ORDER.index(name) for name in model_data['feature_order']]])
+            
+            # Make predictions with a single predict() call
+            predictions = model.predict(X) # type: ignore
             
             print("✅ Prediction successful")
             print(f"   Prediction shape: {predictions.shape}")
@@ -122,7 +149,7 @@ def test_visualizations():
     print("\n📊 Testing visualizations...")
     
     try:
-        from app.plots import create_sankey_diagram
+        create_sankey_diagram = _imp('app.plots').create_sankey_diagram
         
         # Sample prediction data
         sample_predictions = {
@@ -148,7 +175,9 @@ def test_recommendations():
     print("\n💡 Testing recommendations...")
     
     try:
-        from app.recommendations import get_environmental_recommendations, get_circularity_recommendations
+        recommendations = _imp('app.recommendations')
+        get_environmental_recommendations = recommendations.get_environmental_recommendations
+        get_circularity_recommendations = recommendations.get_circularity_recommendations
         
         # Sample prediction data
         sample_predictions = {
@@ -175,6 +204,9 @@ def test_recommendations():
 
 def main():
     """Run all tests"""
+    # Block-buffer output instead of one write per print
+    sys.stdout.reconfigure(line_buffering=False, write_through=False)
+    
     print("🧪 LCA Streamlit App Test Suite")
     print("=" * 40)
     
@@ -186,6 +218,7 @@ def main():
         ("Recommendations", test_recommendations)
     ]
     
+    # Run serially in one process so the import and model-file caches are shared
     results = []
     for test_name, test_func in tests:
         try: